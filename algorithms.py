@@ -0,0 +1,483 @@
+from collections import deque
+
+import numpy as np
+
+from grid import ClosedSet, Grid
+from heuristics import get_heuristic, scaled
+from priority_queue import HeapQueue
+
+FORWARD = 0
+BACKWARD = 1
+
+
+class SearchResult:
+    def __init__(self, shape, path, expanded, cost, sides=None):
+        self.shape = shape
+        # path goes from start to end and is empty when the end can't be reached
+        self.path = path
+        # flat indices of the expanded tiles in the order the algorithm expanded them
+        self.expanded = expanded
+        self.cost = cost
+        # which search expanded each tile, only set by the bidirectional searches
+        self.sides = sides
+        # counters of the solve, only set by search_stats.solve
+        self.stats = None
+
+    @property
+    def found(self):
+        return len(self.path) > 0
+
+    @property
+    def visited(self):
+        rows, cols = np.unravel_index(self.expanded, self.shape)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+
+def no_path(grid):
+    # a board without START or END has nothing to search for
+    return SearchResult(grid.shape, [], np.empty(0, np.int32), float("inf"))
+
+
+def start_only(grid, cost):
+    # start and end on the same tile: the two searches would each step off it
+    # and meet again, so the path is the start expanded by the forward side alone
+    return SearchResult(
+        grid.shape,
+        [grid.pos(grid.start)],
+        np.array([grid.start], dtype=np.int32),
+        cost,
+        np.array([FORWARD], dtype=np.int8),
+    )
+
+
+def reconstruct_path(parent, end_index, cols):
+    # walks the predecessor array back from the end, which happens only once per solve
+    path = []
+    index = end_index
+
+    while index != -1:
+        path.append(divmod(index, cols))
+        index = int(parent[index])
+
+    path.reverse()
+    return path
+
+
+def frontier_search(
+    board,
+    depth_first,
+    on_expand=None,
+    move_diagonally=False,
+    stats=None,
+    start=None,
+    end=None,
+):
+    # start and end: (row, col) instead of the START and END tiles, see Grid
+    grid = Grid(board, move_diagonally, start=start, end=end)
+    if not grid.placed:
+        return no_path(grid)
+
+    # one predecessor per tile instead of a copy of the whole path per queue entry
+    parent = grid.scratch(-1, np.int32)
+
+    closed = ClosedSet(grid.shape, grid.storage)
+    frontier = deque([(grid.start, -1)])
+
+    # stats (a SearchStats) counts the work, see search_stats.py
+    if stats is not None:
+        grid, frontier, on_expand = stats.instrument(grid, frontier, on_expand)
+
+    take = frontier.pop if depth_first else frontier.popleft
+
+    while len(frontier) > 0:
+        current, current_parent = take()
+
+        # the entry which reaches a tile first decides its parent, same as the
+        # path it used to carry
+        if current == grid.end:
+            parent[current] = current_parent
+            break
+        elif current in closed:
+            continue
+
+        parent[current] = current_parent
+        closed.add(current)
+
+        if on_expand is not None:
+            on_expand(grid.pos(current))
+
+        neighbors = grid.neighbors(current)
+        if depth_first:
+            neighbors.reverse()
+
+        for neighbor in neighbors:
+            frontier.append((neighbor, current))
+
+    else:
+        return SearchResult(grid.shape, [], closed.expanded(), float("inf"))
+
+    path = reconstruct_path(parent, grid.end, grid.cols)
+    return SearchResult(grid.shape, path, closed.expanded(), len(path) - 1)
+
+
+def breadth_first_search(
+    board, on_expand=None, move_diagonally=False, stats=None, start=None, end=None
+):
+    return frontier_search(board, False, on_expand, move_diagonally, stats, start, end)
+
+
+def depth_first_search(
+    board, on_expand=None, move_diagonally=False, stats=None, start=None, end=None
+):
+    return frontier_search(board, True, on_expand, move_diagonally, stats, start, end)
+
+
+def dijkstra_search(
+    board,
+    on_expand=None,
+    move_diagonally=False,
+    open_list=HeapQueue,
+    costs=None,
+    stats=None,
+    start=None,
+    end=None,
+):
+    # costs is an optional terrain layer, see Grid
+    grid = Grid(board, move_diagonally, costs, start, end)
+    if not grid.placed:
+        return no_path(grid)
+
+    distance = grid.scratch(np.inf)
+    parent = grid.scratch(-1, np.int32)
+    closed = ClosedSet(grid.shape, grid.storage)
+
+    distance[grid.start] = 0
+
+    pq = open_list(grid.size)
+    if stats is not None:
+        grid, pq, on_expand = stats.instrument(grid, pq, on_expand)
+
+    pq.put(0, grid.start)
+
+    while not pq.empty():
+        current_cost, current = pq.get()
+
+        if current == grid.end:
+            break
+
+        # a tile can still sit in the queue with an older distance
+        if current in closed:
+            continue
+
+        closed.add(current)
+
+        if on_expand is not None:
+            on_expand(grid.pos(current))
+
+        for edge, step_cost in grid.edges(current):
+            if edge not in closed:
+                new_distance = current_cost + step_cost
+
+                if new_distance < distance[edge]:
+                    distance[edge] = new_distance
+                    parent[edge] = current
+                    pq.put(new_distance, edge)
+
+    else:
+        return SearchResult(grid.shape, [], closed.expanded(), float("inf"))
+
+    path = reconstruct_path(parent, grid.end, grid.cols)
+    return SearchResult(grid.shape, path, closed.expanded(), float(distance[grid.end]))
+
+
+def a_star_search(
+    board,
+    on_expand=None,
+    move_diagonally=False,
+    heuristic=None,
+    weight=1,
+    open_list=HeapQueue,
+    costs=None,
+    stats=None,
+    start=None,
+    end=None,
+):
+    # weight > 1 gives weighted A*: fewer expansions, but the path can be up to
+    # `weight` times longer than the optimal one
+    grid = Grid(board, move_diagonally, costs, start, end)
+    if not grid.placed:
+        return no_path(grid)
+
+    # an array holds the estimate of every tile, e.g. from a LandmarkIndex
+    estimates = None
+    if isinstance(heuristic, np.ndarray):
+        estimates = heuristic.reshape(-1).tolist()
+        heuristic = None
+
+    estimate = scaled(get_heuristic(heuristic, move_diagonally), grid.min_cost)
+
+    distance = grid.scratch(np.inf)
+    parent = grid.scratch(-1, np.int32)
+    closed = ClosedSet(grid.shape, grid.storage)
+
+    end_row, end_col = grid.pos(grid.end)
+    cols = grid.cols
+
+    distance[grid.start] = 0
+    start_row, start_col = grid.pos(grid.start)
+    start_heuristic = estimate(abs(start_row - end_row), abs(start_col - end_col))
+    if estimates is not None:
+        start_heuristic = estimates[grid.start]
+
+    pq = open_list(grid.size)
+    if stats is not None:
+        grid, pq, on_expand = stats.instrument(grid, pq, on_expand)
+
+    pq.put(weight * start_heuristic, grid.start, start_heuristic)
+
+    while not pq.empty():
+        _, current = pq.get()
+
+        if current == grid.end:
+            break
+
+        # a tile can still sit in the queue with an older distance
+        if current in closed:
+            continue
+
+        closed.add(current)
+
+        if on_expand is not None:
+            on_expand(grid.pos(current))
+
+        current_distance = distance[current]
+
+        for edge, step_cost in grid.edges(current):
+            if edge not in closed:
+                new_distance = current_distance + step_cost
+
+                if new_distance < distance[edge]:
+                    distance[edge] = new_distance
+                    parent[edge] = current
+
+                    if estimates is None:
+                        row, col = divmod(edge, cols)
+                        edge_heuristic = estimate(
+                            abs(row - end_row), abs(col - end_col)
+                        )
+                    else:
+                        edge_heuristic = estimates[edge]
+
+                    # ordered by g + h, ties go to the tile closer to the end
+                    pq.put(new_distance + weight * edge_heuristic, edge, edge_heuristic)
+
+    else:
+        return SearchResult(grid.shape, [], closed.expanded(), float("inf"))
+
+    path = reconstruct_path(parent, grid.end, grid.cols)
+    return SearchResult(grid.shape, path, closed.expanded(), float(distance[grid.end]))
+
+
+def join_paths(parents, forward_node, backward_node, cols):
+    # start -> forward_node, then backward_node -> end
+    path = reconstruct_path(parents[FORWARD], forward_node, cols)
+    backward_path = reconstruct_path(parents[BACKWARD], backward_node, cols)
+    backward_path.reverse()
+
+    if backward_path[0] == path[-1]:
+        backward_path = backward_path[1:]
+
+    return path + backward_path
+
+
+def bidirectional_breadth_first_search(
+    board, on_expand=None, move_diagonally=False, stats=None, start=None, end=None
+):
+    grid = Grid(board, move_diagonally, start=start, end=end)
+    if not grid.placed:
+        return no_path(grid)
+    if grid.start == grid.end:
+        return start_only(grid, 0)
+
+    if stats is not None:
+        grid, _, on_expand = stats.instrument(grid, None, on_expand)
+
+    # depth of every tile as seen from the start and from the end, -1 if not seen
+    depths = [grid.scratch(-1, np.int32) for _ in range(2)]
+    parents = [grid.scratch(-1, np.int32) for _ in range(2)]
+    frontiers = [[grid.start], [grid.end]]
+
+    depths[FORWARD][grid.start] = 0
+    depths[BACKWARD][grid.end] = 0
+
+    # every tile is expanded at most once by each side. The log is filled in
+    # place like the one of ClosedSet, so it's a mapped file on a huge board
+    expanded = grid.full(0, np.int32, 2 * grid.size)
+    sides = grid.full(0, np.int8, 2 * grid.size)
+    expanded_log, sides_log = memoryview(expanded), memoryview(sides)
+    count = 0
+
+    best = float("inf")
+    meeting = None
+
+    while frontiers[FORWARD] and frontiers[BACKWARD]:
+        # grow the smaller frontier by one whole layer
+        side = (
+            FORWARD if len(frontiers[FORWARD]) <= len(frontiers[BACKWARD]) else BACKWARD
+        )
+        other = 1 - side
+        depth, other_depth, parent = depths[side], depths[other], parents[side]
+        next_frontier = []
+
+        for current in frontiers[side]:
+            expanded_log[count] = current
+            sides_log[count] = side
+            count += 1
+
+            if on_expand is not None:
+                on_expand(grid.pos(current), side)
+
+            current_depth = int(depth[current])
+
+            for neighbor in grid.neighbors(current):
+                # the other search reached this tile: a path through it is a candidate
+                if other_depth[neighbor] != -1:
+                    total = current_depth + 1 + int(other_depth[neighbor])
+
+                    if total < best:
+                        best = total
+                        meeting = (
+                            (current, neighbor)
+                            if side == FORWARD
+                            else (neighbor, current)
+                        )
+
+                if depth[neighbor] == -1:
+                    depth[neighbor] = current_depth + 1
+                    parent[neighbor] = current
+                    next_frontier.append(neighbor)
+
+        # the layers are plain lists, they're counted a whole layer at a time,
+        # the last one as well
+        if stats is not None:
+            stats.pops += len(frontiers[side])
+            stats.pushes += len(next_frontier)
+            stats.max_frontier = max(stats.max_frontier, len(next_frontier))
+
+        # the layer is finished before stopping, so the shortest of the paths
+        # found in it is the shortest overall
+        if meeting is not None:
+            break
+
+        frontiers[side] = next_frontier
+        grid.tick(len(next_frontier))
+
+    expanded, sides = expanded[:count], sides[:count]
+
+    if meeting is None:
+        return SearchResult(grid.shape, [], expanded, float("inf"), sides)
+
+    path = join_paths(parents, meeting[0], meeting[1], grid.cols)
+    return SearchResult(grid.shape, path, expanded, best, sides)
+
+
+def bidirectional_a_star_search(
+    board,
+    on_expand=None,
+    move_diagonally=False,
+    heuristic=None,
+    open_list=HeapQueue,
+    stats=None,
+    start=None,
+    end=None,
+):
+    grid = Grid(board, move_diagonally, start=start, end=end)
+    if not grid.placed:
+        return no_path(grid)
+    if grid.start == grid.end:
+        return start_only(grid, 0.0)
+
+    estimate = get_heuristic(heuristic, move_diagonally)
+    cols = grid.cols
+
+    distances = [grid.scratch(np.inf) for _ in range(2)]
+    parents = [grid.scratch(-1, np.int32) for _ in range(2)]
+    closed = [ClosedSet(grid.shape, grid.storage), ClosedSet(grid.shape, grid.storage)]
+    queues = [open_list(grid.size), open_list(grid.size)]
+
+    if stats is not None:
+        grid, _, on_expand = stats.instrument(grid, None, on_expand)
+        queues = [stats.watch_queue(queue) for queue in queues]
+
+    # the forward search heads for the end, the backward one for the start
+    targets = [grid.pos(grid.end), grid.pos(grid.start)]
+
+    for side, source in ((FORWARD, grid.start), (BACKWARD, grid.end)):
+        row, col = grid.pos(source)
+        target_row, target_col = targets[side]
+        source_heuristic = estimate(abs(row - target_row), abs(col - target_col))
+
+        distances[side][source] = 0
+        queues[side].put(source_heuristic, source, source_heuristic)
+
+    # every tile is expanded at most once by each side. The log is filled in
+    # place like the one of ClosedSet, so it's a mapped file on a huge board
+    expanded = grid.full(0, np.int32, 2 * grid.size)
+    sides = grid.full(0, np.int8, 2 * grid.size)
+    expanded_log, sides_log = memoryview(expanded), memoryview(sides)
+    count = 0
+
+    best = float("inf")
+    meeting = None
+
+    while not queues[FORWARD].empty() and not queues[BACKWARD].empty():
+        # no tile left in either queue can lie on a path shorter than the best one
+        # found, since both heuristics are admissible
+        if best <= max(queues[FORWARD].peek(), queues[BACKWARD].peek()):
+            break
+
+        side = FORWARD if len(queues[FORWARD]) <= len(queues[BACKWARD]) else BACKWARD
+        other = 1 - side
+        distance, other_distance = distances[side], distances[other]
+        target_row, target_col = targets[side]
+
+        _, current = queues[side].get()
+
+        if current in closed[side]:
+            continue
+
+        closed[side].add(current)
+        expanded_log[count] = current
+        sides_log[count] = side
+        count += 1
+
+        if on_expand is not None:
+            on_expand(grid.pos(current), side)
+
+        current_distance = distance[current]
+
+        for edge, step_cost in grid.edges(current):
+            if edge in closed[side]:
+                continue
+
+            new_distance = current_distance + step_cost
+
+            if new_distance < distance[edge]:
+                distance[edge] = new_distance
+                parents[side][edge] = current
+
+                row, col = divmod(edge, cols)
+                edge_heuristic = estimate(abs(row - target_row), abs(col - target_col))
+                queues[side].put(new_distance + edge_heuristic, edge, edge_heuristic)
+
+                if new_distance + other_distance[edge] < best:
+                    best = float(new_distance + other_distance[edge])
+                    meeting = edge
+
+    expanded, sides = expanded[:count], sides[:count]
+
+    if meeting is None:
+        return SearchResult(grid.shape, [], expanded, float("inf"), sides)
+
+    path = join_paths(parents, meeting, meeting, cols)
+    return SearchResult(grid.shape, path, expanded, best, sides)
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithms import (
+    a_star_search,
+    bidirectional_a_star_search,
+    bidirectional_breadth_first_search,
+    breadth_first_search,
+    depth_first_search,
+    dijkstra_search,
+)
+from board import load_maze_from_file
+from components import unreachable_result
+from jump_point_search import jump_point_search
+from wavefront import wavefront_search
+
+# same names as the "choose_algorithm" values in settings.py
+ALGORITHMS = {
+    "breadth_first_search": breadth_first_search,
+    "depth_first_search": depth_first_search,
+    "dijkstra_search": dijkstra_search,
+    "a_star_search": a_star_search,
+    "jump_point_search": jump_point_search,
+    "bidirectional_breadth_first_search": bidirectional_breadth_first_search,
+    "bidirectional_a_star_search": bidirectional_a_star_search,
+    "wavefront_search": wavefront_search,
+}
+
+# boards a worker process has already attached to, by shared memory name
+attached_boards = {}
+
+
+def attach_board(name, shape, dtype):
+    if name not in attached_boards:
+        # workers share the parent's resource tracker, so the block is still
+        # unlinked exactly once, by the parent
+        memory = shared_memory.SharedMemory(name=name)
+        board = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        attached_boards[name] = (memory, board)
+
+    return attached_boards[name][1]
+
+
+def run_job(task):
+    (name, shape, dtype), start, end, algorithm, options = task
+
+    board = attach_board(name, shape, dtype)
+
+    # the shared board never changes, so its regions are labelled once per worker
+    result = unreachable_result(
+        board, start, end, options.get("move_diagonally", False)
+    )
+    if result is not None:
+        return result
+
+    # a job with its own start or end searches the shared board as it is, the
+    # searches take the positions instead of the START and END tiles
+    return ALGORITHMS[algorithm](board, start=start, end=end, **options)
+
+
+def read_jobs(file):
+    # one job per line: {"board": "maze/3.txt", "algorithm": "a_star_search",
+    # "start": [1, 1], "end": [5, 7], "move_diagonally": false}
+    with open(file, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def normalize_job(job):
+    # jobs are (board, start, end, algorithm) tuples or dicts with the same keys,
+    # a board is an array or the path of a maze file
+    if isinstance(job, dict):
+        job = dict(job)
+        board = job.pop("board")
+        start = job.pop("start", None)
+        end = job.pop("end", None)
+        algorithm = job.pop("algorithm", "a_star_search")
+        options = job
+    else:
+        board, start, end, algorithm = job
+        options = {}
+
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    return board, start, end, algorithm, options
+
+
+def solve_batch(jobs, workers=None, chunksize=8):
+    # yields one SearchResult per job, in the order of the jobs
+    jobs = [normalize_job(job) for job in jobs]
+
+    shared = {}
+    tasks = []
+
+    try:
+        for board, start, end, algorithm, options in jobs:
+            # every board is copied into shared memory once, jobs only carry its name
+            key = board if isinstance(board, str) else id(board)
+
+            if key not in shared:
+                array = load_maze_from_file(board) if isinstance(board, str) else board
+                array = np.ascontiguousarray(array)
+
+                memory = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1)
+                )
+                np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+                shared[key] = (memory, (memory.name, array.shape, array.dtype.str))
+
+            tasks.append((shared[key][1], start, end, algorithm, options))
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            yield from executor.map(run_job, tasks, chunksize=chunksize)
+
+    finally:
+        for memory, _ in shared.values():
+            memory.close()
+            memory.unlink()
+
+
+def result_to_json(job, result):
+    board, start, end, algorithm, _ = normalize_job(job)
+
+    return {
+        "board": board if isinstance(board, str) else None,
+        "algorithm": algorithm,
+        "start": start,
+        "end": end,
+        "found": result.found,
+        "cost": result.cost if result.found else None,
+        "expanded": len(result.expanded),
+        "path": [[int(row), int(col)] for row, col in result.path],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a JSONL file of jobs.")
+    parser.add_argument("jobs", help="JSONL file with one job per line")
+    parser.add_argument("-o", "--output", help="JSONL file for the results")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-c", "--chunksize", type=int, default=8)
+    args = parser.parse_args()
+
+    jobs = list(read_jobs(args.jobs))
+    output = open(args.output, "w") if args.output else None
+
+    try:
+        for job, result in zip(jobs, solve_batch(jobs, args.workers, args.chunksize)):
+            line = json.dumps(result_to_json(job, result))
+            print(line, file=output, flush=True)
+    finally:
+        if output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
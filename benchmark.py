@@ -0,0 +1,255 @@
+import argparse
+import csv
+import glob
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms import a_star_search
+from batch import ALGORITHMS
+from board import BORDER_WALL, END, TILE, load_maze_from_file, randomize_board
+from distances import build_landmarks
+from hierarchical import HierarchicalPlanner
+from incremental import LifelongPlanner
+from maze_generators import GENERATORS, generate_maze
+from priority_queue import HeapQueue
+
+# columns of the CSV output, in order
+FIELDS = [
+    "board",
+    "algorithm",
+    "rows",
+    "cols",
+    "found",
+    "path_length",
+    "cost",
+    "expanded",
+    "heap_pushes",
+    "seconds",
+    "peak_memory_mb",
+]
+
+# the searches don't change these between runs, a different value is a change in
+# behaviour rather than noise
+EXACT_FIELDS = ["found", "path_length", "expanded", "heap_pushes"]
+# runs faster than this in the baseline are mostly timer noise, their times
+# aren't compared
+MIN_SECONDS = 0.005
+
+
+class CountingQueue(HeapQueue):
+    # counts the entries pushed by the searches which take an open_list
+    pushes = 0
+
+    def put(self, priority, index, tie=None):
+        CountingQueue.pushes += 1
+        super().put(priority, index, tie)
+
+
+def hierarchical_planner(board):
+    return HierarchicalPlanner(board).find_path()
+
+
+def lifelong_planner(board):
+    return LifelongPlanner(board).plan()
+
+
+def alt_a_star_search(board, open_list=HeapQueue):
+    # A* with the landmark estimates, a board without an END has nothing to
+    # estimate the distance to
+    if not (board == END).any():
+        return a_star_search(board, open_list=open_list)
+
+    estimates = build_landmarks(board).estimates(board)
+    return a_star_search(board, heuristic=estimates, open_list=open_list)
+
+
+# the searches, and the planners which build something before they search. Their
+# times include the building, the first query of a planner pays for it as well
+RUNNERS = {
+    **ALGORITHMS,
+    "hierarchical_planner": hierarchical_planner,
+    "lifelong_planner": lifelong_planner,
+    "alt_a_star_search": alt_a_star_search,
+}
+
+
+def empty_board(size):
+    board = np.full((size + 2, size + 2), TILE, dtype=np.uint8)
+    board[0, :] = board[-1, :] = board[:, 0] = board[:, -1] = BORDER_WALL
+    return board
+
+
+def maze_boards(pattern):
+    for file in sorted(glob.glob(pattern)):
+        yield file, load_maze_from_file(file)
+
+
+def generated_boards(sizes, seeds, generators):
+    # "random" is randomize_board, everything else one of the maze generators
+    for size in sizes:
+        for seed in seeds:
+            for generator in generators:
+                board = empty_board(size)
+
+                if generator == "random":
+                    board = randomize_board(board, size + 2, size + 2, seed)
+                else:
+                    board = generate_maze(board, generator, seed)
+
+                yield f"{generator}-{size}-{seed}", board
+
+
+def run(board, algorithm, repeats, memory):
+    # the fastest of `repeats` runs, and one more under tracemalloc for the peak
+    # memory since tracing slows every allocation down
+    function = RUNNERS[algorithm]
+    counts_pushes = "open_list" in inspect.signature(function).parameters
+    options = {"open_list": CountingQueue} if counts_pushes else {}
+
+    seconds = float("inf")
+    for _ in range(repeats):
+        CountingQueue.pushes = 0
+        start = time.perf_counter()
+        result = function(board, **options)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    pushes = CountingQueue.pushes if counts_pushes else None
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        function(board, **options)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "found": result.found,
+        "path_length": len(result.path),
+        "cost": round(result.cost, 6) if result.found else None,
+        "expanded": len(result.expanded),
+        "heap_pushes": pushes,
+        "seconds": round(seconds, 6),
+        "peak_memory_mb": None if peak is None else round(peak / 2**20, 3),
+    }
+
+
+def run_suite(boards, algorithms, repeats=3, memory=True):
+    for name, board in boards:
+        for algorithm in algorithms:
+            record = {
+                "board": name,
+                "algorithm": algorithm,
+                "rows": board.shape[0],
+                "cols": board.shape[1],
+            }
+            record.update(run(board, algorithm, repeats, memory))
+            yield record
+
+
+def write_csv(records, file):
+    with open(file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def compare(records, baseline, tolerance):
+    # differences to a baseline run, as lines of text: exact fields which
+    # changed, and times more than `tolerance` times slower
+    old_records = {(r["board"], r["algorithm"]): r for r in baseline}
+    regressions = []
+
+    for record in records:
+        key = (record["board"], record["algorithm"])
+        old = old_records.get(key)
+        if old is None:
+            continue
+
+        for field in EXACT_FIELDS:
+            if record[field] != old[field]:
+                regressions.append(
+                    f"{key[0]} {key[1]}: {field} {old[field]} -> {record[field]}"
+                )
+
+        slower = record["seconds"] > tolerance * old["seconds"]
+        if slower and old["seconds"] >= MIN_SECONDS:
+            regressions.append(
+                f"{key[0]} {key[1]}: seconds {old['seconds']} -> {record['seconds']}"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time every algorithm and planner on the maze files and on "
+        "generated boards."
+    )
+    parser.add_argument(
+        "-a", "--algorithms", nargs="+", default=sorted(RUNNERS), choices=RUNNERS
+    )
+    parser.add_argument(
+        "--mazes", default=os.path.join("maze", "*.txt"), help="glob of maze files"
+    )
+    parser.add_argument("--sizes", nargs="*", type=int, default=[50, 100, 200])
+    parser.add_argument("--seeds", nargs="*", type=int, default=[0])
+    parser.add_argument(
+        "--generators",
+        nargs="*",
+        default=["random"],
+        choices=["random", *GENERATORS],
+    )
+    parser.add_argument("-r", "--repeats", type=int, default=3)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the tracemalloc run"
+    )
+    parser.add_argument("-o", "--output", help="JSON file for the results")
+    parser.add_argument("--csv", help="CSV file for the results")
+    parser.add_argument("-b", "--baseline", help="JSON results of an earlier run")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="slowdown against the baseline that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    boards = [
+        *maze_boards(args.mazes),
+        *generated_boards(args.sizes, args.seeds, args.generators),
+    ]
+
+    records = []
+    for record in run_suite(boards, args.algorithms, args.repeats, not args.no_memory):
+        print(json.dumps(record), flush=True)
+        records.append(record)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(records, f, indent=2)
+
+    if args.csv:
+        write_csv(records, args.csv)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(records, json.load(f), args.tolerance)
+
+        # stdout only has the JSON lines of the records
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+
+        # a failing exit code, so a regression can stop a script or CI job
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
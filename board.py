@@ -0,0 +1,158 @@
+import os
+import weakref
+
+import numpy as np
+
+TILE = 0
+WALL = 1
+START = 2
+END = 3
+BORDER_WALL = 4
+
+# number of edits made to every board through set_tile and touch, by id(board),
+# so a cache can tell a board changed without hashing it again
+board_versions = {}
+
+# board value of every byte in a maze file
+UNKNOWN_CHAR = 255
+CHAR_VALUES = np.full(256, UNKNOWN_CHAR, dtype=np.uint8)
+CHAR_VALUES[ord(" ")] = TILE
+CHAR_VALUES[ord("#")] = WALL
+CHAR_VALUES[ord("O")] = START
+CHAR_VALUES[ord("X")] = END
+
+# terrain: the digits 1-9 are tiles which cost that much to enter, every other
+# tile costs 1
+TERRAIN_CHARS = b"123456789"
+CHAR_VALUES[list(TERRAIN_CHARS)] = TILE
+CHAR_COSTS = np.ones(256, dtype=np.float32)
+CHAR_COSTS[list(TERRAIN_CHARS)] = np.arange(1, 10)
+
+
+def touch(board):
+    # marks the whole board as changed, for edits which don't go through set_tile
+    key = id(board)
+
+    if key not in board_versions:
+        # ids are reused once a board is gone, its version has to go with it
+        weakref.finalize(board, board_versions.pop, key, None)
+        board_versions[key] = 0
+
+    board_versions[key] += 1
+
+
+def board_version(board):
+    return board_versions.get(id(board), 0)
+
+
+def set_tile(board, pos, value):
+    if board[pos] != value:
+        board[pos] = value
+        touch(board)
+
+
+def randomize_board(board, board_height, board_width, seed=None):
+    rng = np.random.default_rng(seed)
+
+    # flat indices into the interior, which is everything inside BORDER_WALL
+    interior = board[1 : board_height - 1, 1 : board_width - 1]
+    num_walls = int(board.shape[0] * board.shape[1] * 0.1)
+
+    walls = rng.choice(interior.size, size=num_walls, replace=False)
+    interior[np.unravel_index(walls, interior.shape)] = WALL
+
+    start_pos_index, end_pos_index = rng.choice(interior.size, size=2, replace=False)
+
+    interior[np.unravel_index(start_pos_index, interior.shape)] = START
+    interior[np.unravel_index(end_pos_index, interior.shape)] = END
+
+    touch(board)
+    return board
+
+
+def decode_lines(data, table, fill):
+    # decodes the bytes of a maze file straight through a lookup table, lines
+    # shorter than the longest one are filled up with `fill`
+    chars = np.frombuffer(data, dtype=np.uint8)
+    chars = chars[chars != ord("\r")]
+
+    newlines = chars == ord("\n")
+    ends = np.flatnonzero(newlines)
+    if len(chars) > 0 and not newlines[-1]:
+        ends = np.append(ends, len(chars))
+
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    rows = len(ends)
+    cols = int(lengths.max()) if rows > 0 else 0
+
+    values = table[chars[~newlines]]
+
+    if (lengths == cols).all():
+        return values.reshape(rows, cols)
+
+    line = np.repeat(np.arange(rows), lengths)
+    col = np.arange(len(values)) - np.repeat(starts - np.arange(rows), lengths)
+    decoded = np.full((rows, cols), fill, dtype=table.dtype)
+    decoded[line, col] = values
+    return decoded
+
+
+def parse_maze(data):
+    maze = decode_lines(data, CHAR_VALUES, TILE)
+
+    if (maze == UNKNOWN_CHAR).any():
+        char = next(
+            c for c in data if CHAR_VALUES[c] == UNKNOWN_CHAR and c not in b"\r\n"
+        )
+        raise ValueError(f"Unknown maze character: {chr(char)!r}")
+
+    return np.pad(maze, pad_width=1, constant_values=BORDER_WALL)
+
+
+def parse_costs(data):
+    # the entry cost of every tile, the same shape as the board of the same file
+    costs = decode_lines(data, CHAR_COSTS, 1)
+    return np.pad(costs, pad_width=1, constant_values=1)
+
+
+def load_cached(file, suffix, parse, cache):
+    # the parsed array is kept next to the file, later loads map it without parsing
+    sidecar = os.path.splitext(file)[0] + suffix
+
+    if cache and os.path.exists(sidecar):
+        if os.path.getmtime(sidecar) >= os.path.getmtime(file):
+            # copy on write, so the array can still be edited in memory
+            return np.load(sidecar, mmap_mode="c")
+
+    with open(file, "rb") as f:
+        array = parse(f.read())
+
+    if cache:
+        try:
+            temporary = f"{sidecar}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                np.save(f, array)
+            os.replace(temporary, sidecar)
+        except OSError:
+            # read only directory, the file just gets parsed every time
+            pass
+
+    return array
+
+
+def random_maze_file():
+    mazes = [name for name in os.listdir("maze") if name.endswith(".txt")]
+    return os.path.join("maze", np.random.choice(mazes))
+
+
+def load_maze_from_file(file=None, cache=True):
+    # picks a random maze from the "maze" directory if no file is given
+    if file is None:
+        file = random_maze_file()
+
+    return load_cached(file, ".npy", parse_maze, cache)
+
+
+def load_costs_from_file(file, cache=True):
+    return load_cached(file, ".costs.npy", parse_costs, cache)
@@ -0,0 +1,144 @@
+import weakref
+
+import numpy as np
+
+from algorithms import SearchResult
+from board import BORDER_WALL, END, START, WALL, board_version
+
+# component index of every board seen, by id: {move_diagonally: index}
+component_indices = {}
+
+
+def join_runs(first, second, count):
+    # union find over the runs, vectorised: every round hooks the larger root of
+    # every pair onto the smaller one, then jumps pointers until every run points
+    # at its root. Pairs which share a root are done for good
+    parent = np.arange(count)
+
+    while len(first) > 0:
+        first_root, second_root = parent[first], parent[second]
+        apart = first_root != second_root
+        first, second = first[apart], second[apart]
+        first_root, second_root = first_root[apart], second_root[apart]
+
+        np.minimum.at(
+            parent,
+            np.maximum(first_root, second_root),
+            np.minimum(first_root, second_root),
+        )
+
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    return parent
+
+
+def label_components(board, move_diagonally=False):
+    # label of the connected region of every tile, -1 for walls. Rows are cut
+    # into runs of walkable tiles first, so only the runs touching across rows
+    # have to be joined
+    walkable = (board != WALL) & (board != BORDER_WALL)
+
+    starts = walkable.copy()
+    starts[:, 1:] &= ~walkable[:, :-1]
+    runs = np.cumsum(starts, dtype=np.int64).reshape(board.shape) - 1
+    count = int(runs[-1, -1]) + 1 if board.size > 0 else 0
+
+    # pairs of runs with tiles next to each other, one row apart
+    shifts = [(slice(None), slice(None))]
+    if move_diagonally:
+        shifts += [(slice(None, -1), slice(1, None)), (slice(1, None), slice(None, -1))]
+
+    pairs = []
+    for upper_cols, lower_cols in shifts:
+        touching = walkable[:-1, upper_cols] & walkable[1:, lower_cols]
+        pair = runs[:-1, upper_cols][touching] * count + runs[1:, lower_cols][touching]
+
+        # runs are numbered row by row, so the pairs come out sorted and the
+        # repeats of a pair are next to each other
+        pairs.append(pair[np.diff(pair, prepend=-1) != 0])
+
+    pairs = np.concatenate(pairs)
+    parent = join_runs(pairs // count, pairs % count, count)
+
+    # every region is joined onto its first run, the roots are numbered from 0
+    roots = parent == np.arange(count)
+    run_labels = (np.cumsum(roots) - 1)[parent]
+
+    labels = np.full(board.shape, -1, dtype=np.int32)
+    labels[walkable] = run_labels[runs[walkable]]
+    return labels
+
+
+class ComponentIndex:
+    # labels of the regions of one version of a board. Tiles in different regions
+    # can't reach each other, which is a lookup instead of a search
+    def __init__(self, board, move_diagonally=False):
+        self.shape = board.shape
+        self.labels = label_components(board, move_diagonally)
+        self.count = int(self.labels.max()) + 1 if self.labels.size > 0 else 0
+
+        cells = np.ascontiguousarray(board).reshape(-1)
+        start, end = np.flatnonzero(cells == START), np.flatnonzero(cells == END)
+        self.start = divmod(int(start[0]), self.shape[1]) if len(start) > 0 else None
+        self.end = divmod(int(end[0]), self.shape[1]) if len(end) > 0 else None
+
+    def label(self, pos):
+        return int(self.labels[tuple(pos)])
+
+    def connected(self, start=None, end=None):
+        # start and end default to the START and END tiles on the board, a
+        # missing tile is connected to nothing
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+
+        if start is None or end is None:
+            return False
+
+        return self.label(start) != -1 and self.label(start) == self.label(end)
+
+
+def component_index(board, move_diagonally=False):
+    # labelled again only when the board changed through set_tile or touch since
+    # the last time, edits made by writing into it directly aren't seen
+    key = id(board)
+    indices = component_indices.get(key)
+
+    if indices is None:
+        weakref.finalize(board, component_indices.pop, key, None)
+        indices = component_indices[key] = {}
+
+    version = board_version(board)
+    cached = indices.get(move_diagonally)
+
+    if cached is None or cached[0] != version:
+        cached = indices[move_diagonally] = (
+            version,
+            ComponentIndex(board, move_diagonally),
+        )
+
+    return cached[1]
+
+
+def unreachable_result(board, start=None, end=None, move_diagonally=False):
+    # the result of any search when start and end are in different regions, None
+    # when a search is needed. A start or end given on a wall becomes a tile once
+    # it's placed, which can join regions, so it's left to the search
+    index = component_index(board, move_diagonally)
+
+    start = index.start if start is None else start
+    end = index.end if end is None else end
+
+    if start is None or end is None:
+        return None
+
+    if index.label(start) == -1 or index.label(end) == -1:
+        return None
+
+    if index.connected(start, end):
+        return None
+
+    return SearchResult(board.shape, [], np.empty(0, np.int32), float("inf"))
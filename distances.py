@@ -0,0 +1,198 @@
+import hashlib
+import os
+
+import numpy as np
+
+from board import load_maze_from_file
+from grid import ClosedSet, Grid
+from heuristics import SQRT2
+from priority_queue import HeapQueue
+from wavefront import spread
+
+
+def settle_distances(grid, source, targets=()):
+    # Dijkstra from one source over the whole board, or until every target is
+    # settled; past that point the distances of other tiles can still be too high
+    distance = grid.full(np.inf)
+    closed = ClosedSet(grid.shape, grid.storage)
+
+    remaining = set(targets) - {-1}
+    stop_early = len(remaining) > 0
+
+    distance[source] = 0
+    pq = HeapQueue(grid.size)
+    pq.put(0, source)
+
+    while not pq.empty():
+        current_cost, current = pq.get()
+
+        if current in closed:
+            continue
+
+        closed.add(current)
+        remaining.discard(current)
+        if stop_early and not remaining:
+            break
+
+        for edge, step_cost in grid.edges(current):
+            if edge not in closed:
+                new_distance = current_cost + step_cost
+
+                if new_distance < distance[edge]:
+                    distance[edge] = new_distance
+                    pq.put(new_distance, edge)
+
+    return distance
+
+
+def distances_from(grid, source, targets=()):
+    # cost from source to every tile, inf where it can't be reached. Boards where
+    # every step costs 1 go through the vectorised breadth first search
+    if grid.costs is None and not grid.move_diagonally:
+        steps, _ = spread(grid, source, targets)
+        distance = steps.astype(np.float64)
+        distance[steps == -1] = np.inf
+        return distance
+
+    return settle_distances(grid, source, targets)
+
+
+def distance_matrix(board, sources, targets, move_diagonally=False, costs=None):
+    # cost from every source to every target, one search per source which stops
+    # once all the targets are settled
+    grid = Grid(board, move_diagonally, costs)
+    target_indices = np.array([grid.index(target) for target in targets], np.int64)
+
+    matrix = np.full((len(sources), len(targets)), np.inf)
+
+    for row, source in enumerate(sources):
+        source = grid.index(source)
+        if grid.walkable[source]:
+            matrix[row] = distances_from(grid, source, target_indices)[target_indices]
+
+    return matrix
+
+
+def walls_hash(grid):
+    # landmark distances only depend on where the walls are, START and END can move
+    return hashlib.blake2b(np.packbits(grid.walkable).data, digest_size=16).hexdigest()
+
+
+class LandmarkIndex:
+    # ALT: exact distances from a few landmarks to every tile. For every landmark
+    # L, |d(L, end) - d(L, tile)| <= d(tile, end) by the triangle inequality, which
+    # bounds the distance a lot tighter than the straight line does on mazes.
+    # Only for boards without terrain, where every distance is the same both ways
+    def __init__(self, shape, move_diagonally, walls, landmarks, fields):
+        self.shape = tuple(shape)
+        self.move_diagonally = move_diagonally
+        self.walls = walls
+        # flat indices of the landmarks and one distance field per landmark
+        self.landmarks = landmarks
+        self.fields = fields
+
+    def estimates(self, board, end=None):
+        # admissible estimate of the cost from every tile to end (the END tile by
+        # default), to be passed to a_star_search as the heuristic
+        grid = Grid(board, self.move_diagonally)
+
+        if grid.shape != self.shape or walls_hash(grid) != self.walls:
+            raise ValueError("The landmarks were built for a different board")
+
+        end = grid.end if end is None else grid.index(end)
+        if end == -1:
+            raise ValueError("The board has no END tile")
+
+        # both distances are inf when neither tile can reach the landmark
+        with np.errstate(invalid="ignore"):
+            bounds = np.abs(self.fields - self.fields[:, end, None])
+        bounds[np.isnan(bounds)] = 0
+
+        # the usual heuristic is admissible as well, so the larger one is kept
+        rows, cols = np.divmod(np.arange(grid.size), grid.cols)
+        dy, dx = np.abs(rows - end // grid.cols), np.abs(cols - end % grid.cols)
+        if self.move_diagonally:
+            straight = np.maximum(dy, dx) + (SQRT2 - 1) * np.minimum(dy, dx)
+        else:
+            straight = dy + dx
+
+        return np.maximum(bounds.max(axis=0), straight).reshape(grid.shape)
+
+    def save(self, file):
+        np.savez(
+            file,
+            shape=self.shape,
+            move_diagonally=self.move_diagonally,
+            walls=self.walls,
+            landmarks=self.landmarks,
+            fields=self.fields,
+        )
+
+
+def build_landmarks(board, count=8, move_diagonally=False):
+    grid = Grid(board, move_diagonally)
+
+    walkable = np.flatnonzero(grid.walkable)
+    if len(walkable) == 0:
+        raise ValueError("The board has no walkable tiles")
+
+    # farthest point selection: every landmark is the tile farthest from the
+    # landmarks picked before it, which spreads them around the edges of the board
+    nearest = distances_from(grid, int(walkable[0]))
+    landmarks, fields = [], []
+
+    for _ in range(count):
+        landmark = int(np.where(np.isfinite(nearest), nearest, -1).argmax())
+        if landmarks and nearest[landmark] == 0:
+            break
+
+        field = distances_from(grid, landmark)
+        nearest = field if not landmarks else np.minimum(nearest, field)
+
+        landmarks.append(landmark)
+        fields.append(field)
+
+    return LandmarkIndex(
+        grid.shape,
+        move_diagonally,
+        walls_hash(grid),
+        np.array(landmarks, dtype=np.int64),
+        np.stack(fields),
+    )
+
+
+def load_landmarks(file):
+    with np.load(file) as data:
+        return LandmarkIndex(
+            data["shape"],
+            bool(data["move_diagonally"]),
+            str(data["walls"]),
+            data["landmarks"],
+            data["fields"],
+        )
+
+
+def landmarks_for_file(file, count=8, move_diagonally=False):
+    # the index is kept next to the maze file and built again when the walls of
+    # the maze changed
+    board = load_maze_from_file(file)
+    suffix = ".diagonal.landmarks.npz" if move_diagonally else ".landmarks.npz"
+    sidecar = os.path.splitext(file)[0] + suffix
+
+    if os.path.exists(sidecar):
+        index = load_landmarks(sidecar)
+        grid = Grid(board, move_diagonally)
+
+        if index.shape == grid.shape and index.walls == walls_hash(grid):
+            if len(index.landmarks) >= count:
+                return board, index
+
+    index = build_landmarks(board, count, move_diagonally)
+
+    try:
+        index.save(sidecar)
+    except OSError:
+        # read only directory, the index is built every time
+        pass
+
+    return board, index
@@ -0,0 +1,239 @@
+import mmap
+import tempfile
+
+import numpy as np
+
+from board import BORDER_WALL, END, START, WALL
+
+# the order the searches look at the neighbors of a tile in
+MOVES = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+DIAGONAL_MOVES = [
+    (-1, 0),
+    (-1, 1),
+    (0, 1),
+    (1, 1),
+    (1, 0),
+    (1, -1),
+    (0, -1),
+    (-1, -1),
+]
+
+# memory mapped boards with at least this many tiles keep the search state in
+# memory mapped files too
+HUGE_BOARD_SIZE = 1 << 25
+# tiles filled, scanned or expanded between two page outs of the mapped arrays
+PAGE_OUT_TILES = 1 << 22
+
+
+class MappedStorage:
+    # search state backed by temporary files instead of memory. Every
+    # PAGE_OUT_TILES tiles the pages are handed back to the kernel, which keeps
+    # them in its page cache or writes them out, so the resident memory of the
+    # process stays bounded by what the search touches in between
+    def __init__(self, board, directory=None):
+        self.directory = directory
+        self.maps = []
+        self.ticks = 0
+
+        # a copy on write board would lose its edits, those pages stay resident
+        if board.mode != "c" and isinstance(board.base, mmap.mmap):
+            self.maps.append(board.base)
+
+    def full(self, size, fill, dtype):
+        dtype = np.dtype(dtype)
+
+        # the file is gone once closed, the mapping keeps it alive until then
+        with tempfile.TemporaryFile(dir=self.directory) as f:
+            f.truncate(max(size * dtype.itemsize, 1))
+            memory = mmap.mmap(f.fileno(), 0)
+
+        self.maps.append(memory)
+        array = np.frombuffer(memory, dtype=dtype, count=size)
+
+        # new files read as zeros, anything else is written one chunk at a time
+        if fill != 0:
+            for chunk in chunks(size):
+                array[chunk] = fill
+                self.tick(chunk.stop - chunk.start)
+
+        return array
+
+    def tick(self, tiles=1):
+        self.ticks += tiles
+        if self.ticks >= PAGE_OUT_TILES:
+            self.page_out()
+
+    def page_out(self):
+        for memory in self.maps:
+            memory.madvise(mmap.MADV_DONTNEED)
+        self.ticks = 0
+
+
+def chunks(size):
+    for start in range(0, size, PAGE_OUT_TILES):
+        yield slice(start, min(start + PAGE_OUT_TILES, size))
+
+
+class Grid:
+    def __init__(self, board, move_diagonally=False, costs=None, start=None, end=None):
+        self.shape = board.shape
+        self.rows, self.cols = board.shape
+        self.size = board.size
+        self.move_diagonally = move_diagonally
+
+        self.storage = None
+        if isinstance(board, np.memmap) and board.size >= HUGE_BOARD_SIZE:
+            self.storage = MappedStorage(board)
+
+        # tiles are addressed by their flat index: row * cols + col
+        self.cells = np.ascontiguousarray(board).reshape(-1)
+
+        self.walkable = self.full(False, np.bool_)
+        for chunk in self.chunks():
+            cells = self.cells[chunk]
+            self.walkable[chunk] = (cells != WALL) & (cells != BORDER_WALL)
+            self.tick(chunk.stop - chunk.start)
+
+        # start and end default to the START and END tiles. Given positions are
+        # used as they are, without copying the board to move the markers; they
+        # count as walkable, the same as a marker put there would
+        self.start = self.find(START) if start is None else self.index(start)
+        self.end = self.find(END) if end is None else self.index(end)
+
+        for position, index in ((start, self.start), (end, self.end)):
+            if position is not None:
+                self.walkable[index] = True
+
+        # the searches look at one tile at a time, which is a lot cheaper on bytes
+        # than on a NumPy array; a huge board gets a view of its mapped file
+        if self.storage is None:
+            self.walkable_bytes = self.walkable.tobytes()
+        else:
+            self.walkable_bytes = memoryview(self.walkable)
+
+        self.moves = DIAGONAL_MOVES if move_diagonally else MOVES
+        self.offsets = np.array([dy * self.cols + dx for dy, dx in self.moves])
+        # straight steps cost 1, diagonal steps cost sqrt(2)
+        self.step_costs = np.hypot(*np.array(self.moves).T)
+        # the same as Python numbers, (offset, step cost) for every move
+        self.steps = list(zip(self.offsets.tolist(), self.step_costs.tolist()))
+
+        # entry cost of every tile: a step costs its length times the cost of the
+        # tile it goes to, None when every tile costs 1
+        self.costs = None
+        self.cost_list = None
+        self.min_cost = 1.0
+
+        if costs is not None:
+            if costs.shape != board.shape:
+                raise ValueError("The costs must have the same shape as the board")
+
+            self.costs = np.ascontiguousarray(costs).reshape(-1)
+            self.cost_list = self.costs.tolist() if self.storage is None else self.costs
+
+            if self.walkable.any():
+                self.min_cost = float(self.costs[self.walkable].min())
+                if self.min_cost <= 0:
+                    raise ValueError("Every walkable tile must cost more than 0")
+
+    @property
+    def placed(self):
+        # the searches need both START and END on the board
+        return self.start != -1 and self.end != -1
+
+    def full(self, fill, dtype=np.float64, size=None):
+        # one value per tile (or `size` values), in memory or in a mapped file for
+        # huge boards
+        size = self.size if size is None else size
+        if self.storage is None:
+            return np.full(size, fill, dtype=dtype)
+        return self.storage.full(size, fill, dtype)
+
+    def scratch(self, fill, dtype=np.float64):
+        # full, seen through a memoryview: the searches index it one tile at a time,
+        # which gives Python numbers instead of the much slower NumPy scalars
+        return memoryview(self.full(fill, dtype))
+
+    def chunks(self):
+        # the whole board at once, unless the temporaries wouldn't fit in memory
+        if self.storage is None:
+            return [slice(0, self.size)]
+        return chunks(self.size)
+
+    def find(self, value):
+        for chunk in self.chunks():
+            indices = np.flatnonzero(self.cells[chunk] == value)
+            if len(indices) > 0:
+                return chunk.start + int(indices[0])
+
+            self.tick(chunk.stop - chunk.start)
+
+        return -1
+
+    def tick(self, tiles=1):
+        # lets a huge board page out the state of a search as it goes
+        if self.storage is not None:
+            self.storage.tick(tiles)
+
+    def index(self, pos):
+        return int(pos[0]) * self.cols + int(pos[1])
+
+    def pos(self, index):
+        return divmod(int(index), self.cols)
+
+    def neighbors(self, index):
+        # the board is surrounded by BORDER_WALL, so offsets never leave the board
+        walkable = self.walkable_bytes
+        return [index + offset for offset, _ in self.steps if walkable[index + offset]]
+
+    def edges(self, index):
+        # pairs of (neighbor, cost of the step to it)
+        walkable, costs = self.walkable_bytes, self.cost_list
+        edges = [
+            (index + offset, step_cost)
+            for offset, step_cost in self.steps
+            if walkable[index + offset]
+        ]
+
+        if costs is not None:
+            edges = [(edge, step_cost * costs[edge]) for edge, step_cost in edges]
+
+        return edges
+
+
+class ClosedSet:
+    def __init__(self, shape, storage=None):
+        self.shape = shape
+        self.storage = storage
+        size = int(np.prod(shape))
+
+        if storage is None:
+            self.mask = np.zeros(shape, dtype=np.bool_)
+            # every tile is closed at most once, so the log never outgrows the board
+            self.order = np.empty(size, dtype=np.int32)
+        else:
+            self.mask = storage.full(size, False, np.bool_).reshape(shape)
+            self.order = storage.full(size, 0, np.int32)
+
+        # flat views of the same memory, so tiles can be checked and logged by
+        # their flat index without going through NumPy scalars
+        self.flat = memoryview(self.mask.reshape(-1))
+        self.log = memoryview(self.order)
+        self.count = 0
+
+    def __contains__(self, index):
+        return self.flat[index]
+
+    def __len__(self):
+        return self.count
+
+    def add(self, index):
+        self.flat[index] = True
+        self.log[self.count] = index
+        self.count += 1
+
+        if self.storage is not None:
+            self.storage.tick()
+
+    def expanded(self):
+        return self.order[: self.count]
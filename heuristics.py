@@ -0,0 +1,54 @@
+import math
+
+# every heuristic gets the absolute row and column distance to the end
+SQRT2 = math.sqrt(2)
+
+
+def manhattan(dy, dx):
+    # admissible only when moving in 4 directions
+    return dy + dx
+
+
+def octile(dy, dx):
+    # exact on an open board with 8 directions and diagonal steps costing sqrt(2)
+    return max(dy, dx) + (SQRT2 - 1) * min(dy, dx)
+
+
+def euclidean(dy, dx):
+    return math.hypot(dy, dx)
+
+
+def chebyshev(dy, dx):
+    # exact on an open board with 8 directions if diagonal steps cost 1,
+    # still admissible when they cost sqrt(2)
+    return max(dy, dx)
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "octile": octile,
+    "euclidean": euclidean,
+    "chebyshev": chebyshev,
+}
+
+
+def get_heuristic(heuristic, move_diagonally):
+    if heuristic is None:
+        return octile if move_diagonally else manhattan
+
+    if callable(heuristic):
+        return heuristic
+
+    try:
+        return HEURISTICS[heuristic]
+    except KeyError:
+        raise ValueError(f"Unknown heuristic: {heuristic}") from None
+
+
+def scaled(heuristic, factor):
+    # with terrain every step costs at least `factor` times its length, so the
+    # scaled heuristic is still admissible
+    if factor == 1:
+        return heuristic
+
+    return lambda dy, dx: factor * heuristic(dy, dx)
@@ -0,0 +1,392 @@
+import heapq
+
+import numpy as np
+
+from algorithms import SearchResult
+from board import BORDER_WALL, END, START, TILE, WALL, board_version
+from grid import MOVES, Grid
+from wavefront import spread
+
+# boundaries between a cluster and the one below it or right of it
+DOWN = 0
+RIGHT = 1
+
+# entrances at least this wide get a transition at both ends instead of one in
+# the middle
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalPlanner:
+    # HPA*: the board is cut into square clusters. Every entrance between two
+    # neighbouring clusters gives a pair of tiles, one on each side, which are the
+    # nodes of a small abstract graph; its edges are the steps across entrances and
+    # the distances between the nodes of each cluster. A query searches the
+    # abstract graph and then finds the tile by tile path only inside the clusters
+    # the abstract path goes through. Paths are close to, not always, the shortest.
+    # Straight moves only
+    def __init__(self, board, cluster_size=32):
+        self.board = board
+        self.cluster_size = cluster_size
+        self.rows, self.cols = board.shape
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self.offsets = [dy * self.cols + dx for dy, dx in MOVES]
+
+        # the board as the abstraction was built for, edits are found by comparing
+        cells = np.ascontiguousarray(board).reshape(-1)
+        self.planned = cells.copy()
+        self.version = board_version(board)
+
+        # one walkable byte per tile, with an array view of the same memory
+        self.walkable = bytearray(((cells != WALL) & (cells != BORDER_WALL)).tobytes())
+        self.walkable_tiles = np.frombuffer(self.walkable, dtype=np.bool_).reshape(
+            board.shape
+        )
+
+        self.start = self.find(START)
+        self.end = self.find(END)
+
+        # transitions (pairs of tiles) of every boundary, nodes of every cluster
+        # and the abstract graph as {tile: {tile: cost}}
+        self.transitions = {}
+        self.nodes = {}
+        self.graph = {}
+
+        self.rebuild(range(self.cluster_rows * self.cluster_cols))
+
+    def find(self, value):
+        indices = np.flatnonzero(self.planned == value)
+        return int(indices[0]) if len(indices) > 0 else -1
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.cols)
+        size = self.cluster_size
+        return (row // size) * self.cluster_cols + col // size
+
+    def bounds(self, cluster):
+        # first and last + 1 row and column of the cluster
+        size = self.cluster_size
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        return (
+            cluster_row * size,
+            min((cluster_row + 1) * size, self.rows),
+            cluster_col * size,
+            min((cluster_col + 1) * size, self.cols),
+        )
+
+    def boundaries(self, cluster):
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        boundaries = []
+
+        if cluster_row > 0:
+            boundaries.append((cluster - self.cluster_cols, DOWN))
+        if cluster_row < self.cluster_rows - 1:
+            boundaries.append((cluster, DOWN))
+        if cluster_col > 0:
+            boundaries.append((cluster - 1, RIGHT))
+        if cluster_col < self.cluster_cols - 1:
+            boundaries.append((cluster, RIGHT))
+
+        return boundaries
+
+    def find_transitions(self, boundary):
+        # pairs of facing tiles across the boundary, one or two per entrance
+        cluster, direction = boundary
+        top, bottom, left, right = self.bounds(cluster)
+        walkable = self.walkable_tiles
+
+        if direction == DOWN:
+            open_tiles = walkable[bottom - 1, left:right] & walkable[bottom, left:right]
+            first = (bottom - 1) * self.cols + left
+            stride, across = 1, self.cols
+        else:
+            open_tiles = walkable[top:bottom, right - 1] & walkable[top:bottom, right]
+            first = top * self.cols + right - 1
+            stride, across = self.cols, 1
+
+        transitions = []
+        positions = np.flatnonzero(open_tiles)
+
+        for entrance in np.split(positions, np.flatnonzero(np.diff(positions) > 1) + 1):
+            if len(entrance) == 0:
+                continue
+
+            if len(entrance) < WIDE_ENTRANCE:
+                picked = [entrance[len(entrance) // 2]]
+            else:
+                picked = [entrance[0], entrance[-1]]
+
+            for position in picked:
+                tile = first + int(position) * stride
+                transitions.append((tile, tile + across))
+
+        return transitions
+
+    def rebuild(self, touched):
+        # the boundaries of the touched clusters are found again, which changes the
+        # nodes of the clusters on both sides of them
+        touched = set(touched)
+        boundaries = {boundary for c in touched for boundary in self.boundaries(c)}
+        affected = set(touched)
+
+        for boundary in boundaries:
+            self.transitions[boundary] = self.find_transitions(boundary)
+            cluster, direction = boundary
+            affected.add(cluster)
+            affected.add(cluster + (self.cluster_cols if direction == DOWN else 1))
+
+        for cluster in affected:
+            for node in self.nodes.get(cluster, ()):
+                for neighbor in self.graph.pop(node, {}):
+                    self.graph.get(neighbor, {}).pop(node, None)
+
+        for cluster in affected:
+            nodes = set()
+            for boundary in self.boundaries(cluster):
+                for pair in self.transitions[boundary]:
+                    nodes.update(
+                        tile for tile in pair if self.cluster_of(tile) == cluster
+                    )
+
+            self.nodes[cluster] = nodes
+            for node in nodes:
+                self.graph[node] = {}
+
+        for cluster in affected:
+            for boundary in self.boundaries(cluster):
+                for tile, other in self.transitions[boundary]:
+                    self.graph[tile][other] = 1
+                    self.graph[other][tile] = 1
+
+        self.connect(affected)
+
+    def connect(self, clusters):
+        # distances between the nodes of every cluster, inside the cluster. The
+        # k-th node of all the clusters is searched from at once: moves between
+        # clusters are blocked, so the searches never meet
+        clusters = sorted(clusters)
+        size = self.cluster_size
+
+        cluster_rows = [c // self.cluster_cols for c in clusters]
+        cluster_cols = [c % self.cluster_cols for c in clusters]
+        top = min(cluster_rows) * size
+        bottom = min((max(cluster_rows) + 1) * size, self.rows)
+        left = min(cluster_cols) * size
+        right = min((max(cluster_cols) + 1) * size, self.cols)
+
+        # only the part of the board with the clusters in it, surrounded by a wall
+        window = np.where(self.walkable_tiles[top:bottom, left:right], TILE, WALL)
+        grid = Grid(np.pad(window.astype(np.uint8), 1, constant_values=BORDER_WALL))
+
+        rows = np.arange(top - 1, bottom + 1)
+        cols = np.arange(left - 1, right + 1)
+        labels = np.add.outer((rows // size) * self.cluster_cols, cols // size).reshape(
+            -1
+        )
+
+        def window_index(tile):
+            row, col = divmod(tile, self.cols)
+            return (row - top + 1) * grid.cols + col - left + 1
+
+        nodes = {c: sorted(self.nodes[c]) for c in clusters}
+
+        for k in range(max(map(len, nodes.values()), default=0)):
+            sources = [c for c in clusters if len(nodes[c]) > k]
+            distance, _ = spread(
+                grid, [window_index(nodes[c][k]) for c in sources], labels=labels
+            )
+
+            for cluster in sources:
+                node = nodes[cluster][k]
+
+                for other in nodes[cluster][k + 1 :]:
+                    steps = int(distance[window_index(other)])
+                    if steps != -1:
+                        self.graph[node][other] = steps
+                        self.graph[other][node] = steps
+
+    def update(self, changed=None):
+        # changed: positions edited since the abstraction was built, found by
+        # comparing the board when not given
+        cells = np.ascontiguousarray(self.board).reshape(-1)
+
+        if changed is None:
+            if board_version(self.board) == self.version:
+                return
+            changed = np.flatnonzero(cells != self.planned)
+        else:
+            changed = [int(row) * self.cols + int(col) for row, col in changed]
+
+        self.version = board_version(self.board)
+        touched = set()
+
+        for index in map(int, changed):
+            old, new = int(self.planned[index]), int(cells[index])
+            self.planned[index] = new
+
+            if new == START:
+                self.start = index
+            elif old == START and self.start == index:
+                self.start = -1
+
+            if new == END:
+                self.end = index
+            elif old == END and self.end == index:
+                self.end = -1
+
+            walkable = new != WALL and new != BORDER_WALL
+            if self.walkable[index] != walkable:
+                self.walkable[index] = walkable
+                touched.add(self.cluster_of(index))
+
+        if touched:
+            self.rebuild(touched)
+
+    def local_search(self, source, targets):
+        # breadth first search inside the cluster of source until every target is
+        # reached, returns the parent and the depth of every tile reached
+        top, bottom, left, right = self.bounds(self.cluster_of(source))
+        walkable, cols = self.walkable, self.cols
+
+        parent = {source: -1}
+        depth = {source: 0}
+        remaining = set(targets) - {source}
+        frontier = [source]
+
+        while frontier and remaining:
+            next_frontier = []
+
+            for current in frontier:
+                for offset in self.offsets:
+                    neighbor = current + offset
+                    if neighbor in parent:
+                        continue
+
+                    row, col = divmod(neighbor, cols)
+                    if (
+                        top <= row < bottom
+                        and left <= col < right
+                        and walkable[neighbor]
+                    ):
+                        parent[neighbor] = current
+                        depth[neighbor] = depth[current] + 1
+                        remaining.discard(neighbor)
+                        next_frontier.append(neighbor)
+
+            frontier = next_frontier
+
+        return parent, depth
+
+    def refine(self, tile, other):
+        # the tiles after `tile` up to `other`, both in the same cluster
+        if other - tile in self.offsets:
+            return [other]
+
+        parent, _ = self.local_search(tile, [other])
+        tiles = []
+        while other != tile:
+            tiles.append(other)
+            other = parent[other]
+
+        tiles.reverse()
+        return tiles
+
+    def find_path(self, start=None, end=None):
+        # start and end default to the START and END tiles on the board
+        self.update()
+
+        start = (
+            self.start if start is None else int(start[0]) * self.cols + int(start[1])
+        )
+        end = self.end if end is None else int(end[0]) * self.cols + int(end[1])
+        shape = (self.rows, self.cols)
+
+        if (
+            start == -1
+            or end == -1
+            or not self.walkable[start]
+            or not self.walkable[end]
+        ):
+            return SearchResult(shape, [], np.empty(0, np.int32), float("inf"))
+
+        # start and end are joined to the nodes of their clusters for this query only
+        extra = {start: {}, end: {}}
+        start_cluster, end_cluster = self.cluster_of(start), self.cluster_of(end)
+
+        targets = set(self.nodes[start_cluster])
+        if start_cluster == end_cluster:
+            targets.add(end)
+
+        _, depth = self.local_search(start, targets)
+        for node, steps in depth.items():
+            if node in targets:
+                extra[start][node] = steps
+
+        _, depth = self.local_search(end, self.nodes[end_cluster])
+        for node, steps in depth.items():
+            if node in self.nodes[end_cluster]:
+                extra.setdefault(node, {})[end] = steps
+
+        path, expanded = self.search_abstract(start, end, extra)
+
+        if path is None:
+            return SearchResult(shape, [], np.array(expanded, np.int32), float("inf"))
+
+        tiles = [start]
+        for tile, other in zip(path, path[1:]):
+            tiles.extend(self.refine(tile, other))
+
+        return SearchResult(
+            shape,
+            [divmod(tile, self.cols) for tile in tiles],
+            np.array(expanded, dtype=np.int32),
+            len(tiles) - 1,
+        )
+
+    def search_abstract(self, start, end, extra):
+        # A* over the abstract graph, with the manhattan distance between the tiles
+        end_row, end_col = divmod(end, self.cols)
+
+        def estimate(tile):
+            row, col = divmod(tile, self.cols)
+            return abs(row - end_row) + abs(col - end_col)
+
+        distance = {start: 0}
+        parent = {start: None}
+        closed = set()
+        expanded = []
+        heap = [(estimate(start), 0, start)]
+
+        while heap:
+            _, current_distance, current = heapq.heappop(heap)
+
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded.append(current)
+
+            if current == end:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parent[current]
+                path.reverse()
+                return path, expanded
+
+            edges = list(self.graph.get(current, {}).items())
+            edges += extra.get(current, {}).items()
+
+            for neighbor, cost in edges:
+                new_distance = current_distance + cost
+
+                if neighbor not in closed and new_distance < distance.get(
+                    neighbor, float("inf")
+                ):
+                    distance[neighbor] = new_distance
+                    parent[neighbor] = current
+                    heapq.heappush(
+                        heap,
+                        (new_distance + estimate(neighbor), new_distance, neighbor),
+                    )
+
+        return None, expanded
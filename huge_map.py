@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+from batch import ALGORITHMS
+from board import load_maze_from_file
+from search_stats import solve
+
+
+def peak_rss():
+    # in bytes, ru_maxrss is in kilobytes on Linux but already in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_board(file):
+    # boards are mapped read only, a maze file is parsed into its .npy sidecar
+    # first unless that's already done
+    if not file.endswith(".npy"):
+        load_maze_from_file(file)
+        file = os.path.splitext(file)[0] + ".npy"
+
+    return np.load(file, mmap_mode="r")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve a board too big for memory, with the board and the "
+        "search state in memory mapped files."
+    )
+    parser.add_argument("board", help=".npy board or maze file")
+    parser.add_argument(
+        "-a", "--algorithm", default="a_star_search", choices=sorted(ALGORITHMS)
+    )
+    parser.add_argument("-d", "--diagonal", action="store_true")
+    parser.add_argument(
+        "-s", "--stats", action="store_true", help="count the work of the search"
+    )
+    parser.add_argument(
+        "-p",
+        "--profile",
+        choices=["cprofile", "sample"],
+        help="profile the search, implies --stats",
+    )
+    args = parser.parse_args()
+
+    board = open_board(args.board)
+    algorithm = ALGORITHMS[args.algorithm]
+
+    start = time.perf_counter()
+    if args.stats or args.profile:
+        result = solve(algorithm, board, args.profile, move_diagonally=args.diagonal)
+    else:
+        result = algorithm(board, move_diagonally=args.diagonal)
+    seconds = time.perf_counter() - start
+
+    report = {
+        "board": args.board,
+        "shape": list(board.shape),
+        "algorithm": args.algorithm,
+        "found": result.found,
+        "cost": result.cost if result.found else None,
+        "expanded": len(result.expanded),
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round(peak_rss() / 2**20, 1),
+    }
+
+    if result.stats is not None:
+        report["stats"] = result.stats.as_dict()
+    print(json.dumps(report))
+
+    # the profile goes after the report, to stderr so stdout stays one JSON line
+    if args.profile == "cprofile":
+        result.stats.profile.stream = sys.stderr
+        result.stats.profile.sort_stats("cumulative").print_stats(20)
+    elif args.profile == "sample":
+        for function, samples in result.stats.samples.most_common(20):
+            print(f"{samples:8d}  {function}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import heapq
+import math
+
+import numpy as np
+
+from algorithms import SearchResult
+from board import BORDER_WALL, END, START, WALL, board_version
+from grid import Grid
+from heuristics import get_heuristic
+
+INF = float("inf")
+# distances are kept as integers in units of 1 / SCALE, so sums of diagonal steps
+# compare exactly: with floats two routes of the same length can differ in the
+# last bit, which ends a plan before the distances settle
+SCALE = 1 << 20
+
+
+class LifelongPlanner:
+    # Lifelong Planning A*: keeps the distance from the start (g) and its one step
+    # lookahead (rhs) of every tile between plans. When tiles flip between TILE
+    # and WALL only the tiles whose distance changed are expanded again, instead
+    # of the whole search. Moving START or END starts over
+    def __init__(self, board, move_diagonally=False, heuristic=None):
+        self.board = board
+        self.move_diagonally = move_diagonally
+        self.estimate = get_heuristic(heuristic, move_diagonally)
+        self.reset()
+
+    def reset(self):
+        grid = Grid(self.board, self.move_diagonally)
+        self.grid = grid
+        self.cols = grid.cols
+        self.start, self.end = grid.start, grid.end
+        self.end_pos = grid.pos(grid.end)
+
+        # Python containers, the search looks at one tile at a time
+        self.walkable = bytearray(grid.walkable.tobytes())
+        # step costs are rounded up and estimates down, so the estimate stays
+        # admissible and consistent in whole units
+        self.moves = [(offset, math.ceil(cost * SCALE)) for offset, cost in grid.steps]
+        self.step_costs = dict(grid.steps)
+        self.g = [INF] * grid.size
+        self.rhs = [INF] * grid.size
+
+        # the board as it was planned for, edits are found by comparing with it
+        self.planned = np.ascontiguousarray(self.board).reshape(-1).copy()
+        self.version = board_version(self.board)
+
+        # lazy deletion: an entry is current while it matches keys[index]
+        self.heap = []
+        self.keys = {}
+
+        if self.start != -1:
+            self.rhs[self.start] = 0
+            self.push(self.start)
+
+    def key(self, index):
+        distance = min(self.g[index], self.rhs[index])
+        row, col = divmod(index, self.cols)
+        estimate = self.estimate(abs(row - self.end_pos[0]), abs(col - self.end_pos[1]))
+        return (distance + math.floor(estimate * SCALE), distance)
+
+    def push(self, index):
+        key = self.key(index)
+        self.keys[index] = key
+        heapq.heappush(self.heap, (key, index))
+
+    def top_key(self):
+        heap, keys = self.heap, self.keys
+
+        while heap and keys.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+        return heap[0][0] if heap else (INF, INF)
+
+    def update_tile(self, index):
+        g, walkable = self.g, self.walkable
+
+        # moves are symmetric, so the tiles leading to this one are its neighbors
+        if index != self.start:
+            best = INF
+
+            if walkable[index]:
+                for offset, step_cost in self.moves:
+                    neighbor = index + offset
+                    if walkable[neighbor] and g[neighbor] + step_cost < best:
+                        best = g[neighbor] + step_cost
+
+            self.rhs[index] = best
+
+        if g[index] != self.rhs[index]:
+            self.push(index)
+        else:
+            self.keys.pop(index, None)
+
+    def update_neighbors(self, index):
+        for offset, _ in self.moves:
+            self.update_tile(index + offset)
+
+    def compute(self):
+        g, rhs, end = self.g, self.rhs, self.end
+        expanded = []
+
+        # top_key drops the stale entries, the heap can only run out once every
+        # tile is consistent
+        while self.top_key() < self.key(end) or (rhs[end] != g[end] and self.heap):
+            _, current = heapq.heappop(self.heap)
+            del self.keys[current]
+            expanded.append(current)
+
+            if g[current] > rhs[current]:
+                g[current] = rhs[current]
+            else:
+                g[current] = INF
+                self.update_tile(current)
+
+            self.update_neighbors(current)
+
+        return expanded
+
+    def changed_tiles(self):
+        # edits made through set_tile or touch bump the board version, so an
+        # unchanged board isn't compared at all
+        if board_version(self.board) == self.version:
+            return np.empty(0, dtype=np.int64)
+
+        self.version = board_version(self.board)
+        return np.flatnonzero(
+            np.ascontiguousarray(self.board).reshape(-1) != self.planned
+        )
+
+    def plan(self, changed=None):
+        # changed: positions edited since the last plan, found by comparing the
+        # board when not given
+        if self.end == -1 or self.start == -1:
+            return SearchResult(self.grid.shape, [], np.empty(0, np.int32), INF)
+
+        if changed is None:
+            changed = self.changed_tiles()
+        else:
+            changed = [self.grid.index(pos) for pos in changed]
+
+        cells = np.ascontiguousarray(self.board).reshape(-1)
+
+        for index in map(int, changed):
+            old, new = int(self.planned[index]), int(cells[index])
+
+            if old in (START, END) or new in (START, END):
+                self.reset()
+                break
+
+            self.planned[index] = new
+            self.walkable[index] = new != WALL and new != BORDER_WALL
+            self.update_tile(index)
+            self.update_neighbors(index)
+
+        expanded = np.array(self.compute(), dtype=np.int32)
+
+        if self.g[self.end] == INF:
+            return SearchResult(self.grid.shape, [], expanded, INF)
+
+        path, cost = self.path()
+        return SearchResult(self.grid.shape, path, expanded, cost)
+
+    def path(self):
+        # from the end back to the start, always onto the neighbor the distance
+        # came through. The distance goes down with every step, so the walk ends
+        # at the start or stops with an error, it can't go around in circles
+        g, walkable = self.g, self.walkable
+        index = self.end
+        path = [index]
+        steps = []
+
+        while index != self.start:
+            best, closest, closest_offset = INF, -1, 0
+            for offset, step_cost in self.moves:
+                neighbor = index + offset
+                if walkable[neighbor] and g[neighbor] + step_cost < best:
+                    best, closest, closest_offset = (
+                        g[neighbor] + step_cost,
+                        neighbor,
+                        offset,
+                    )
+
+            if closest == -1 or g[closest] >= g[index]:
+                raise RuntimeError(
+                    f"No neighbor of {self.grid.pos(index)} is closer to the start"
+                )
+
+            index = closest
+            path.append(index)
+            steps.append(self.step_costs[-closest_offset])
+
+        path.reverse()
+        steps.reverse()
+
+        # the cost in the same floats the other searches add up, start to end
+        cost = 0.0
+        for step_cost in steps:
+            cost += step_cost
+
+        return [self.grid.pos(index) for index in path], cost
@@ -0,0 +1,320 @@
+from functools import partial
+
+import numpy as np
+
+from algorithms import SearchResult, no_path
+from grid import ClosedSet, Grid
+from heuristics import manhattan, octile
+from priority_queue import HeapQueue
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def jump_horizontal(walkable, cols, end, node, dx, known):
+    # the jump from node to the left or right. known[dx] holds the jump of every
+    # tile scanned so far, -2 where none was made yet: every tile a scan passes
+    # has the same jump as the tile it started from, so each row is scanned at
+    # most once per direction however many vertical jumps look along it
+    known = known[dx]
+    if known[node] != -2:
+        return known[node]
+
+    scanned = [node]
+    index = node + dx
+    jump_point = -1
+
+    while walkable[index]:
+        if index == end or (
+            (walkable[index - cols] and not walkable[index - cols - dx])
+            or (walkable[index + cols] and not walkable[index + cols - dx])
+        ):
+            jump_point = index
+            break
+
+        if known[index] != -2:
+            jump_point = known[index]
+            break
+
+        scanned.append(index)
+        index += dx
+
+    for index in scanned:
+        known[index] = jump_point
+
+    return jump_point
+
+
+def jump_straight(walkable, cols, end, node, dy, dx, known):
+    # 4 directions: walks from node in one direction until it finds a tile
+    # with a forced neighbor, the end, or a wall (-1)
+    if dx:
+        return jump_horizontal(walkable, cols, end, node, dx, known)
+
+    step = dy * cols
+    index = node + step
+
+    while walkable[index]:
+        if index == end:
+            return index
+
+        if (walkable[index - 1] and not walkable[index - 1 - step]) or (
+            walkable[index + 1] and not walkable[index + 1 - step]
+        ):
+            return index
+
+        # going vertically, a horizontal jump point makes this tile one too
+        if (
+            jump_horizontal(walkable, cols, end, index, 1, known) != -1
+            or jump_horizontal(walkable, cols, end, index, -1, known) != -1
+        ):
+            return index
+
+        index += step
+
+    return -1
+
+
+def passes_through(walkable, cols, end, node, dy, dx):
+    # 4 directions: a tile a vertical jump stopped at without a forced neighbor
+    # of its own, only because a horizontal jump from it finds one
+    if dx or node == end:
+        return False
+
+    step = dy * cols
+    return not (
+        (walkable[node - 1] and not walkable[node - 1 - step])
+        or (walkable[node + 1] and not walkable[node + 1 - step])
+    )
+
+
+def jump_diagonal(walkable, cols, end, node, dy, dx):
+    # 8 directions, diagonal steps are allowed whenever the target tile is walkable
+    step = dy * cols + dx
+    index = node + step
+
+    while walkable[index]:
+        if index == end:
+            return index
+
+        if dy and dx:
+            if (walkable[index + dy * cols - dx] and not walkable[index - dx]) or (
+                walkable[index - dy * cols + dx] and not walkable[index - dy * cols]
+            ):
+                return index
+
+            # going diagonally, a straight jump point makes this tile one too
+            if (
+                jump_diagonal(walkable, cols, end, index, 0, dx) != -1
+                or jump_diagonal(walkable, cols, end, index, dy, 0) != -1
+            ):
+                return index
+
+        elif dx:
+            if (walkable[index + cols + dx] and not walkable[index + cols]) or (
+                walkable[index - cols + dx] and not walkable[index - cols]
+            ):
+                return index
+        else:
+            if (walkable[index + dy * cols + 1] and not walkable[index + 1]) or (
+                walkable[index + dy * cols - 1] and not walkable[index - 1]
+            ):
+                return index
+
+        index += step
+
+    return -1
+
+
+def prune_straight(walkable, cols, node, dy, dx):
+    if dx:
+        directions = [(-1, 0), (1, 0), (0, dx)]
+    else:
+        directions = [(0, -1), (0, 1), (dy, 0)]
+
+    return [(ny, nx) for ny, nx in directions if walkable[node + ny * cols + nx]]
+
+
+def prune_diagonal(walkable, cols, node, dy, dx):
+    directions = []
+
+    if dy and dx:
+        if walkable[node + dy * cols]:
+            directions.append((dy, 0))
+        if walkable[node + dx]:
+            directions.append((0, dx))
+        if walkable[node + dy * cols + dx]:
+            directions.append((dy, dx))
+        # forced neighbors behind a blocked side
+        if not walkable[node - dx]:
+            directions.append((dy, -dx))
+        if not walkable[node - dy * cols]:
+            directions.append((-dy, dx))
+
+    elif dx:
+        if walkable[node + dx]:
+            directions.append((0, dx))
+        if not walkable[node + cols]:
+            directions.append((1, dx))
+        if not walkable[node - cols]:
+            directions.append((-1, dx))
+
+    else:
+        if walkable[node + dy * cols]:
+            directions.append((dy, 0))
+        if not walkable[node + 1]:
+            directions.append((dy, 1))
+        if not walkable[node - 1]:
+            directions.append((dy, -1))
+
+    return directions
+
+
+def expand_jumps(parent, end_index, cols):
+    # fills in the straight and diagonal runs between consecutive jump points
+    jump_points = []
+    index = end_index
+
+    while index != -1:
+        jump_points.append(index)
+        index = int(parent[index])
+
+    jump_points.reverse()
+
+    path = [divmod(jump_points[0], cols)]
+
+    for index in jump_points[1:]:
+        row, col = path[-1]
+        end_row, end_col = divmod(index, cols)
+        dy, dx = sign(end_row - row), sign(end_col - col)
+
+        while (row, col) != (end_row, end_col):
+            row, col = row + dy, col + dx
+            path.append((row, col))
+
+    return path
+
+
+def jump_point_search(
+    board,
+    on_expand=None,
+    move_diagonally=False,
+    open_list=HeapQueue,
+    stats=None,
+    start=None,
+    end=None,
+):
+    # only works for boards where every step costs the same, which all of ours do
+    grid = Grid(board, move_diagonally, start=start, end=end)
+    if not grid.placed:
+        return no_path(grid)
+
+    cols = grid.cols
+    end = grid.end
+
+    # bytes, or a view of the mapped file of a huge board, see Grid
+    walkable = grid.walkable_bytes
+
+    if move_diagonally:
+        jump, prune, estimate = jump_diagonal, prune_diagonal, octile
+    else:
+        # the horizontal jumps of every tile, to the right and to the left
+        known = {1: grid.scratch(-2, np.int32), -1: grid.scratch(-2, np.int32)}
+        jump = partial(jump_straight, known=known)
+        prune, estimate = prune_straight, manhattan
+
+    distance = grid.scratch(np.inf)
+    parent = grid.scratch(-1, np.int32)
+    closed = ClosedSet(grid.shape, grid.storage)
+
+    end_row, end_col = grid.pos(end)
+    start_row, start_col = grid.pos(grid.start)
+    start_heuristic = estimate(abs(start_row - end_row), abs(start_col - end_col))
+
+    distance[grid.start] = 0
+
+    pq = open_list(grid.size)
+
+    # the jumps read the walkable bytes directly, so only the queue and the
+    # drawing are counted, not the neighbor checks
+    if stats is not None:
+        grid, pq, on_expand = stats.instrument(grid, pq, on_expand)
+
+    pq.put(start_heuristic, grid.start, start_heuristic)
+
+    while not pq.empty():
+        _, current = pq.get()
+
+        if current == end:
+            break
+
+        if current in closed:
+            continue
+
+        closed.add(current)
+
+        if on_expand is not None:
+            on_expand(grid.pos(current))
+
+        row, col = divmod(current, cols)
+        current_parent = int(parent[current])
+
+        if current_parent == -1:
+            directions = [
+                (dy, dx) for dy, dx in grid.moves if walkable[current + dy * cols + dx]
+            ]
+        else:
+            parent_row, parent_col = divmod(current_parent, cols)
+            directions = prune(
+                walkable,
+                cols,
+                current,
+                sign(row - parent_row),
+                sign(col - parent_col),
+            )
+
+        # jumps still to make: (tile, its distance, direction), the last one first
+        current_distance = distance[current]
+        pending = [
+            (current, current_distance, dy, dx) for dy, dx in reversed(directions)
+        ]
+
+        while pending:
+            node, node_distance, dy, dx = pending.pop()
+            jump_point = jump(walkable, cols, end, node, dy, dx)
+
+            if jump_point == -1 or jump_point in closed:
+                continue
+
+            node_row, node_col = divmod(node, cols)
+            jump_row, jump_col = divmod(jump_point, cols)
+            new_distance = node_distance + estimate(
+                abs(jump_row - node_row), abs(jump_col - node_col)
+            )
+
+            if new_distance < distance[jump_point]:
+                distance[jump_point] = new_distance
+                parent[jump_point] = node
+
+                # a vertical jump which only stopped for a horizontal jump point
+                # has the jumps to either side and straight on as its successors,
+                # they're made right away instead of queueing the tile first
+                if not move_diagonally and passes_through(
+                    walkable, cols, end, jump_point, dy, dx
+                ):
+                    pending.append((jump_point, new_distance, dy, 0))
+                    pending.append((jump_point, new_distance, 0, 1))
+                    pending.append((jump_point, new_distance, 0, -1))
+                    continue
+
+                jump_heuristic = estimate(
+                    abs(jump_row - end_row), abs(jump_col - end_col)
+                )
+                pq.put(new_distance + jump_heuristic, jump_point, jump_heuristic)
+
+    else:
+        return SearchResult(grid.shape, [], closed.expanded(), float("inf"))
+
+    path = expand_jumps(parent, end, cols)
+    return SearchResult(grid.shape, path, closed.expanded(), float(distance[end]))
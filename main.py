@@ -1,150 +1,59 @@
 import json
 import os
-import queue
+import time
 
 import numpy as np
 import pygame
 
 import settings
+from algorithms import (
+    BACKWARD,
+    FORWARD,
+    a_star_search,
+    bidirectional_a_star_search,
+    bidirectional_breadth_first_search,
+    breadth_first_search,
+    depth_first_search,
+    dijkstra_search,
+)
+from board import (
+    BORDER_WALL,
+    END,
+    START,
+    TILE,
+    WALL,
+    load_costs_from_file,
+    load_maze_from_file,
+    random_maze_file,
+    randomize_board,
+    set_tile,
+)
+from components import component_index, unreachable_result
+from jump_point_search import jump_point_search
+from maze_generators import generate_maze
+from playback import Playback
+from rendering import (
+    COLORS,
+    EMPTY,
+    PATH,
+    VISITED,
+    VISITED_BACKWARD,
+    BoardRenderer,
+)
+from wavefront import wavefront_search
 
 FPS = 100
+PLAYBACK_FPS = 60
+MAX_PLAYBACK_TIME = 10
 WIDTH, HEIGHT = 700, 700
 TILE_WIDTH, TILE_HEIGHT = None, None
 
-TILE = 0
-WALL = 1
-START = 2
-END = 3
-BORDER_WALL = 4
-
-COLORS = {
-    "BG_COLOR": (255, 255, 255),
-    "TILE_COLOR": (210, 210, 210),
-    "WALL_COLOR": (128, 128, 128),
-    "TEXT_BG_COLOR": (150, 150, 150),
-    "TEXT_COLOR": (0, 0, 0),
-    "GREEN": (0, 255, 0),
-    "ORANGE": (255, 165, 0),
-    "RED": (255, 0, 0),
-}
+# the searches which follow terrain costs, the others treat every tile as cost 1
+TERRAIN_ALGORITHMS = (dijkstra_search, a_star_search)
 
 pygame.init()
 
 
-class DijkstraVertex:
-    def __init__(self, pos_y, pos_x):
-        self.x = pos_x
-        self.y = pos_y
-        self.distance = float("inf")
-        self.visited = False
-        self.parent = None
-        self.edges = []
-
-    def __lt__(self, other):
-        return self.distance < other.distance
-
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
-
-    def get_pos(self):
-        return (self.y, self.x)
-
-
-class AstarVertex:
-    def __init__(self, pos_y, pos_x):
-        self.x = pos_x
-        self.y = pos_y
-        self.edges = []
-        self.distance = float("inf")
-        self.heuristic = 0
-        self.visited = False
-        self.parent = None
-
-    def __lt__(self, other):
-        return self.distance + self.heuristic < other.distance + other.heuristic
-
-    def __eq__(self, other):
-        return (self.x, self.y) == (other.x, other.y)
-
-    def set_heuristic(self, goal):
-        self.heuristic = abs(self.x - goal.x) + abs(self.y - goal.y)
-
-    def get_pos(self):
-        return (self.y, self.x)
-
-
-def main_draw(window, board, path, was_here, at_start=False):
-    window.fill(COLORS["BG_COLOR"])
-
-    font = pygame.font.SysFont(None, int(min(TILE_WIDTH, TILE_HEIGHT)))
-
-    text_width, text_height = font.size("O")
-    align_start_x = (TILE_WIDTH - text_width) / 2
-    align_start_y = (TILE_HEIGHT - text_height) / 2
-
-    text_width, text_height = font.size("X")
-    align_end_x = (TILE_WIDTH - text_width) / 2
-    align_end_y = (TILE_HEIGHT - text_height) / 2
-
-    for row_id, row in enumerate(board):
-        for col_id, col in enumerate(row):
-            color = COLORS["TILE_COLOR"]
-
-            if (row_id, col_id) in path:
-                color = COLORS["GREEN"]
-
-            elif (row_id, col_id) in was_here:
-                color = COLORS["ORANGE"]
-
-            elif col == WALL or col == BORDER_WALL:
-                color = COLORS["WALL_COLOR"]
-
-            elif col == END:
-                color = COLORS["RED"]
-
-            pygame.draw.rect(
-                window,
-                color,
-                (
-                    col_id * TILE_WIDTH,
-                    row_id * TILE_HEIGHT,
-                    TILE_WIDTH - 1,
-                    TILE_HEIGHT - 1,
-                ),
-            )
-
-            if col == START:
-                pygame.draw.rect(
-                    window,
-                    COLORS["GREEN"],
-                    (
-                        col_id * TILE_WIDTH,
-                        row_id * TILE_HEIGHT,
-                        TILE_WIDTH - 1,
-                        TILE_HEIGHT - 1,
-                    ),
-                )
-                window.blit(
-                    font.render("O", True, COLORS["TEXT_COLOR"]),
-                    (
-                        col_id * TILE_WIDTH + align_start_x,
-                        row_id * TILE_HEIGHT + align_start_y,
-                    ),
-                )
-
-            elif col == END:
-                window.blit(
-                    font.render("X", True, COLORS["TEXT_COLOR"]),
-                    (
-                        col_id * TILE_WIDTH + align_end_x,
-                        row_id * TILE_HEIGHT + align_end_y,
-                    ),
-                )
-
-    if not at_start:
-        pygame.display.update()
-
-
 def mouse_pressed(mouse_pos, board, value):
     row, col = int(mouse_pos[1] / TILE_HEIGHT), int(mouse_pos[0] / TILE_WIDTH)
 
@@ -152,7 +61,7 @@ def mouse_pressed(mouse_pos, board, value):
         return None
 
     if (value == START or value == END) and board[row, col] == TILE:
-        board[row, col] = value
+        set_tile(board, (row, col), value)
         return row, col
 
     elif (
@@ -160,7 +69,16 @@ def mouse_pressed(mouse_pos, board, value):
         and board[row, col] != START
         and board[row, col] != END
     ):
-        board[row, col] = value
+        set_tile(board, (row, col), value)
+
+
+def paint_cost(mouse_pos, board, costs, cost):
+    # terrain goes on tiles and turns walls back into tiles
+    row, col = int(mouse_pos[1] / TILE_HEIGHT), int(mouse_pos[0] / TILE_WIDTH)
+
+    if board[row, col] == TILE or board[row, col] == WALL:
+        set_tile(board, (row, col), TILE)
+        set_tile(costs, (row, col), cost)
 
 
 def select_pos_text(window, text):
@@ -199,321 +117,148 @@ def start_button(window):
     )  # x1 y1 x2 y2
 
 
-def find_neighbors(board, pos, move_diagonally=False):
-    if move_diagonally:
-        possibleMoves = [
-            (-1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-        ]
-    else:
-        possibleMoves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-
-    neighbors = []
-    y, x = pos
-
-    for dy, dx in possibleMoves:
-        new_y = y + dy
-        new_x = x + dx
-
-        if board[new_y, new_x] != WALL and board[new_y, new_x] != BORDER_WALL:
-            neighbors.append((new_y, new_x))
-
-    return neighbors
+def show_trace(renderer, playback, shown, new_shown):
+    expanded, sides = playback.expanded, playback.sides
 
+    if new_shown > shown:
+        batch = slice(shown, new_shown)
+        # VISITED for the forward search, VISITED_BACKWARD for the backward one
+        renderer.set_indices(expanded[batch][sides[batch] == FORWARD], VISITED)
+        renderer.set_indices(
+            expanded[batch][sides[batch] == BACKWARD], VISITED_BACKWARD
+        )
 
-def find_value(board, value):
-    y_indices, x_indices = np.where(board == value)
-    return y_indices[0], x_indices[0]
+    elif new_shown < shown:
+        renderer.set_indices(expanded[new_shown:shown], EMPTY)
 
 
-def breadth_first_search(window, clock, board, showProcess):
-    start_pos = find_value(board, START)
-    end_pos = find_value(board, END)
-
-    visited = []
-    q = queue.Queue()
-    q.put((start_pos, [start_pos]))
-
-    while not q.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current_pos, path = q.get()
-
-        if current_pos == end_pos:
-            break
-        elif current_pos in visited:
-            continue
-
-        visited.append(current_pos)
-
-        if showProcess:
-            main_draw(window, board, [], visited)
-            clock.tick(FPS)
-
-        for neighbor in find_neighbors(board, current_pos):
-            new_path = path + [neighbor]
-            q.put((neighbor, new_path))
-
-    else:
-        main_draw(window, board, [], visited)
-        return
-
-    main_draw(window, board, path, visited)
-
-
-def depth_first_search(window, clock, board, showProcess):
-    start_pos = find_value(board, START)
-    end_pos = find_value(board, END)
-
-    visited = []
-    stack = [(start_pos, [start_pos])]
-
-    while len(stack) > 0:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current_pos, path = stack.pop()
-
-        if current_pos == end_pos:
-            break
-        elif current_pos in visited:
-            continue
-
-        visited.append(current_pos)
-
-        if showProcess:
-            main_draw(window, board, [], visited)
-            clock.tick(FPS)
-
-        try:
-            neighbors = find_neighbors(board, current_pos)
-            neighbors.reverse()
-        except:
-            pass
-
-        for neighbor in neighbors:
-            new_path = path + [neighbor]
-            stack.append((neighbor, new_path))
-
-    else:
-        main_draw(window, board, [], visited)
-        return
-
-    main_draw(window, board, path, visited)
-
-
-def find_edges(board, vertices, vertex, move_diagonally=False):
-    if board[vertex.get_pos()] == BORDER_WALL or board[vertex.get_pos()] == WALL:
-        return []
-
-    if move_diagonally:
-        possible_moves = [
-            (-1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-        ]
-    else:
-        possible_moves = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+def hide_path(renderer, playback, result, shown):
+    renderer.set_tiles(result.path, EMPTY)
 
-    edges = []
-    y, x = vertex.get_pos()
+    # path tiles which are already part of the shown trace get their colour back
+    rows, cols = zip(*result.path)
+    path_indices = np.ravel_multi_index((rows, cols), result.shape)
 
-    for dy, dx in possible_moves:
-        new_y = y + dy
-        new_x = x + dx
+    expanded, sides = playback.expanded[:shown], playback.sides[:shown]
+    on_path = np.isin(expanded, path_indices)
 
-        if board[new_y, new_x] != WALL and board[new_y, new_x] != BORDER_WALL:
-            edges.append((new_y, new_x))
+    renderer.set_indices(expanded[on_path & (sides == FORWARD)], VISITED)
+    renderer.set_indices(expanded[on_path & (sides == BACKWARD)], VISITED_BACKWARD)
 
-    return [vertices[y, x] for y, x in edges]
 
+def play(window, clock, board, result, showProcess, costs=None, regions=None):
+    renderer = BoardRenderer(window, board, costs=costs, regions=regions)
+    renderer.show()
 
-def dijkstra_search(window, clock, board, showProcess):
-    start_pos = find_value(board, START)
-    end_pos = find_value(board, END)
-
-    rows, cols = board.shape
-    vertices = np.array(
-        [[DijkstraVertex(y, x) for x in range(cols)] for y in range(rows)]
+    # at the old pace of one expansion per FPS tick, but never longer than
+    # MAX_PLAYBACK_TIME seconds however big the board is
+    playback = Playback(
+        result,
+        duration=min(len(result.expanded) / FPS, MAX_PLAYBACK_TIME),
+        fps=PLAYBACK_FPS,
     )
+    if not showProcess:
+        playback.seek(playback.total)
 
-    for row in vertices:
-        for col in row:
-            col.edges = find_edges(board, vertices, col)
-
-    start_vertex = vertices[start_pos]
-    start_vertex.distance = 0
-    end_vertex = vertices[end_pos]
-
-    pq = queue.PriorityQueue()
-    pq.put((start_vertex.distance, start_vertex))
-
-    path = []
-    visited = []
-
-    while not pq.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current_cost, current = pq.get()
-
-        if current == end_vertex:
-            while current.parent:
-                path.append(current.get_pos())
-                current = current.parent
-            path.append(current.get_pos())
-            break
-
-        current.visited = True
-        visited.append(current.get_pos())
-
-        if showProcess:
-            main_draw(window, board, [], visited)
-            clock.tick(FPS)
-
-        for edge in current.edges:
-            if not edge.visited:
-                new_distance = current_cost + 1
-
-                if new_distance < edge.distance:
-                    edge.distance = new_distance
-                    edge.parent = current
-                    pq.put((edge.distance, edge))
-
-    else:
-        main_draw(window, board, [], visited)
-        return
-
-    main_draw(window, board, path, visited)
+    # how far the window is behind the playback
+    shown = 0
+    path_shown = False
+    work_time = 0.0
 
-
-def a_star_search(window, clock, board, showProcess):
-    start_pos = find_value(board, START)
-    end_pos = find_value(board, END)
-
-    rows, cols = board.shape
-    vertices = np.array([[AstarVertex(y, x) for x in range(cols)] for y in range(rows)])
-
-    startVertex = vertices[start_pos]
-    startVertex.distance = 0
-    endVertex = vertices[end_pos]
-
-    for row in vertices:
-        for col in row:
-            col.edges = find_edges(board, vertices, col)
-            col.set_heuristic(endVertex)
-
-    pq = queue.PriorityQueue()
-    pq.put((startVertex.heuristic, startVertex))
-
-    path = []
-    visited = []
-
-    while not pq.empty():
+    # space - pause, left/right - scrub, up/down - speed, home/end - jump,
+    # escape or closing the window quits
+    while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current_distance, current = pq.get()
-
-        if current == endVertex:
-            while current.parent:
-                path.append(current.get_pos())
-                current = current.parent
-            path.append(current.get_pos())
-            break
-
-        current.visited = True
-        visited.append(current.get_pos())
-
-        if showProcess:
-            main_draw(window, board, [], visited)
-            clock.tick(FPS)
-
-        for edge in current.edges:
-            if not edge.visited:
-                new_distance = current_distance + 1
-
-                if new_distance < edge.distance:
-                    edge.distance = new_distance
-                    edge.parent = current
-                    edge.heuristic -= new_distance
-                    pq.put((edge.heuristic, edge))
-
+                return
+
+            if event.type == pygame.KEYDOWN:
+                match event.key:
+                    case pygame.K_ESCAPE:
+                        return
+                    case pygame.K_SPACE:
+                        playback.toggle_pause()
+                    case pygame.K_RIGHT:
+                        playback.scrub(max(playback.total // 100, 1))
+                    case pygame.K_LEFT:
+                        playback.scrub(-max(playback.total // 100, 1))
+                    case pygame.K_UP:
+                        playback.faster()
+                    case pygame.K_DOWN:
+                        playback.slower()
+                    case pygame.K_HOME:
+                        playback.seek(0)
+                    case pygame.K_END:
+                        playback.seek(playback.total)
+
+        frame_start = time.perf_counter()
+        new_shown = playback.advance(work_time)
+
+        # the path goes over the trace, so it's taken off before the trace changes
+        if path_shown and new_shown != shown:
+            hide_path(renderer, playback, result, shown)
+            path_shown = False
+
+        show_trace(renderer, playback, shown, new_shown)
+        shown = new_shown
+
+        # without a path there's nothing to draw or to take off again
+        if playback.finished and not path_shown and result.found:
+            renderer.set_tiles(result.path, PATH)
+            path_shown = True
+
+        renderer.update()
+        work_time = time.perf_counter() - frame_start
+        clock.tick(PLAYBACK_FPS)
+
+
+def run_algorithm(window, clock, board, algorithm, showProcess, costs=None):
+    # start and end in different regions are rejected without a search, the
+    # regions are shown instead of a trace
+    result = unreachable_result(board)
+    if result is not None:
+        regions = component_index(board).labels
+        play(window, clock, board, result, showProcess, costs, regions)
+        return result
+
+    # the search runs to the end without drawing, the trace is played back after
+    if costs is not None and algorithm in TERRAIN_ALGORITHMS:
+        result = algorithm(board, costs=costs)
     else:
-        main_draw(window, board, [], visited)
+        result = algorithm(board)
 
-    main_draw(window, board, path, visited)
+    play(window, clock, board, result, showProcess, costs)
 
+    return result
 
-def randomize_board(board, board_height, board_width):
-    num_walls = int(board.shape[0] * board.shape[1] * 0.1)
-    interior_indices = [
-        (row, col)
-        for row in range(1, board_height - 1)
-        for col in range(1, board_width - 1)
-    ]
 
-    indices_to_set = np.random.choice(
-        len(interior_indices), size=num_walls, replace=False
-    )
-    for idx in indices_to_set:
-        row, col = interior_indices[idx]
-        board[row, col] = WALL
-
-    start_pos_index, end_pos_index = np.random.choice(
-        len(interior_indices), size=2, replace=False
-    )
-
-    board[interior_indices[start_pos_index]] = START
-    board[interior_indices[end_pos_index]] = END
-
-    return board
-
-
-def load_maze_from_file():
-    files = os.listdir("maze")
-    file = np.random.choice(files)
-
-    with open(f"maze/{file}", "r") as f:
-        maze = [list(line.rstrip("\n")) for line in f]
-
-    maze = np.array(maze)
-
-    maze[maze == "X"] = END
-    maze[maze == "O"] = START
-    maze[maze == "#"] = WALL
-    maze[maze == " "] = TILE
-
-    maze = np.pad(maze, pad_width=1, constant_values=BORDER_WALL)
-
-    return maze.astype(np.uint8)
-
-
-def draw_board(board, window, clock):
+def draw_board(board, costs, window, clock):
     start_pos, end_pos = None, None
+    # what the left button paints: None for walls, otherwise a terrain cost
+    brush = None
+    show_regions = False
+
+    # the board changes under the mouse, so it's drawn as a whole every frame
+    renderer = BoardRenderer(window, board, use_array=True, editable=True, costs=costs)
+    pygame.display.set_caption(
+        "Keys 1-9 paint terrain costs, 0 paints walls, R shows the regions"
+    )
 
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
 
-        main_draw(window, board, [], [], True)
+            if event.type == pygame.KEYDOWN and pygame.K_0 <= event.key <= pygame.K_9:
+                cost = event.key - pygame.K_0
+                brush = cost if cost > 0 else None
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                show_regions = not show_regions
+
+        # labelled again only after an edit, see component_index
+        renderer.regions = component_index(board).labels if show_regions else None
+        renderer.draw()
 
         if start_pos == None:
             select_pos_text(window, "Select a start tile (O)")
@@ -539,14 +284,18 @@ def draw_board(board, window, clock):
                     break
 
                 if pygame.mouse.get_pressed()[0]:
-                    mouse_pressed(mouse_pos, board, WALL)
+                    if brush is None:
+                        mouse_pressed(mouse_pos, board, WALL)
+                    else:
+                        paint_cost(mouse_pos, board, costs, brush)
 
                 elif pygame.mouse.get_pressed()[2]:
-                    mouse_pressed(mouse_pos, board, TILE)
+                    paint_cost(mouse_pos, board, costs, 1)
 
         pygame.display.update()
         clock.tick(60)
 
+    pygame.display.set_caption("PATHFINDING ALGORITHM")
     return board
 
 
@@ -554,7 +303,7 @@ def get_board(is_draw_maze, window, clock, settings):
     # set board width and height
     # +2 because I add borders around the board
     board_width, board_height = settings["width"] + 2, settings["height"] + 2
-    board = np.full(shape=(board_height, board_height), fill_value=TILE)
+    board = np.full(shape=(board_height, board_width), fill_value=TILE, dtype=np.uint8)
 
     global TILE_WIDTH
     global TILE_HEIGHT
@@ -570,17 +319,25 @@ def get_board(is_draw_maze, window, clock, settings):
     if is_draw_maze == "randomize":
         board = randomize_board(board, board_height, board_width)
 
-    # if is_draw_maze is set to "draw" the user chooses start -> end -> walls
+    # if is_draw_maze is set to "generate" the walls are carved into a proper maze
+    elif is_draw_maze == "generate":
+        board = generate_maze(board)
+
+    # if is_draw_maze is set to "draw" the user chooses start -> end -> walls and terrain
     elif is_draw_maze == "draw":
-        board = draw_board(board, window, clock)
+        costs = np.ones(board.shape, dtype=np.float32)
+        board = draw_board(board, costs, window, clock)
+        return board, costs
 
     # if is_draw_maze is set to "file" program chooses a random file to load the maze from
     elif is_draw_maze == "file":
-        board = load_maze_from_file()
+        file = random_maze_file()
+        board = load_maze_from_file(file)
         board_height, board_width = board.shape
         TILE_WIDTH, TILE_HEIGHT = WIDTH / board_width, HEIGHT / board_height
+        return board, load_costs_from_file(file)
 
-    return board
+    return board, None
 
 
 def main():
@@ -601,29 +358,56 @@ def main():
     pygame.display.set_caption("PATHFINDING ALGORITHM")
 
     # loads the board depending on
-    board = get_board(is_draw_maze, window, clock, settings)
-
-    # print the board before algorithms
-    main_draw(window, board, [], [])
+    board, costs = get_board(is_draw_maze, window, clock, settings)
 
     match settings["choose_algorithm"]:
         case "breadth_first_search":
-            breadth_first_search(window, clock, board, is_show_process)
+            run_algorithm(
+                window, clock, board, breadth_first_search, is_show_process, costs
+            )
 
         case "depth_first_search":
-            depth_first_search(window, clock, board, is_show_process)
+            run_algorithm(
+                window, clock, board, depth_first_search, is_show_process, costs
+            )
 
         case "dijkstra_search":
-            dijkstra_search(window, clock, board, is_show_process)
+            run_algorithm(window, clock, board, dijkstra_search, is_show_process, costs)
 
         case "a_star_search":
-            a_star_search(window, clock, board, is_show_process)
+            run_algorithm(window, clock, board, a_star_search, is_show_process, costs)
 
-    # to stop the program from exiting after the algorithm ends
-    while True:
-        event = pygame.event.wait()
-        if event.type == pygame.QUIT or event.type == pygame.KEYDOWN:
-            break
+        case "jump_point_search":
+            run_algorithm(
+                window, clock, board, jump_point_search, is_show_process, costs
+            )
+
+        case "bidirectional_breadth_first_search":
+            run_algorithm(
+                window,
+                clock,
+                board,
+                bidirectional_breadth_first_search,
+                is_show_process,
+                costs,
+            )
+
+        case "bidirectional_a_star_search":
+            run_algorithm(
+                window,
+                clock,
+                board,
+                bidirectional_a_star_search,
+                is_show_process,
+                costs,
+            )
+
+        case "wavefront_search":
+            run_algorithm(
+                window, clock, board, wavefront_search, is_show_process, costs
+            )
+
+    # the playback keeps the window open until the user quits
     pygame.quit()
 
 
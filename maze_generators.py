@@ -0,0 +1,186 @@
+import random
+
+import numpy as np
+
+from board import END, START, TILE, WALL, touch
+
+# the board is a lattice of cells on odd rows and columns, with the walls
+# between them on even ones; every generator carves a perfect maze, exactly one
+# path between any two cells
+STEPS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def cell_shape(board):
+    rows, cols = (board.shape[0] - 1) // 2, (board.shape[1] - 1) // 2
+
+    if rows * cols < 2:
+        raise ValueError("A maze needs room for at least two cells")
+
+    return rows, cols
+
+
+def fill_walls(board, rows, cols):
+    # interior walls everywhere, then the cells opened up, BORDER_WALL stays
+    board[1:-1, 1:-1] = WALL
+    board[1 : 2 * rows : 2, 1 : 2 * cols : 2] = TILE
+
+
+def carve(board, cell, other, cols):
+    # opens the wall between two neighbouring cells
+    row = (cell // cols) + (other // cols) + 1
+    col = (cell % cols) + (other % cols) + 1
+    board[row, col] = TILE
+
+
+def recursive_backtracker(board, rng):
+    # random depth first walk, backing up at dead ends: long winding corridors
+    rows, cols = cell_shape(board)
+    fill_walls(board, rows, cols)
+
+    visited = bytearray(rows * cols)
+    current = rng.randrange(rows * cols)
+    visited[current] = 1
+    stack = [current]
+
+    while stack:
+        current = stack[-1]
+        row, col = divmod(current, cols)
+
+        options = [
+            (row + dy) * cols + col + dx
+            for dy, dx in STEPS
+            if 0 <= row + dy < rows
+            and 0 <= col + dx < cols
+            and not visited[(row + dy) * cols + col + dx]
+        ]
+
+        if not options:
+            stack.pop()
+            continue
+
+        other = rng.choice(options)
+        carve(board, current, other, cols)
+        visited[other] = 1
+        stack.append(other)
+
+
+def kruskal(board, rng):
+    # every wall in random order, opened when it separates two unjoined regions
+    rows, cols = cell_shape(board)
+    fill_walls(board, rows, cols)
+
+    cells = np.arange(rows * cols).reshape(rows, cols)
+    edges = np.concatenate(
+        (
+            np.stack((cells[:, :-1].ravel(), cells[:, 1:].ravel()), axis=1),
+            np.stack((cells[:-1].ravel(), cells[1:].ravel()), axis=1),
+        )
+    ).tolist()
+    rng.shuffle(edges)
+
+    root = list(range(rows * cols))
+
+    def find(cell):
+        while root[cell] != cell:
+            root[cell] = root[root[cell]]
+            cell = root[cell]
+        return cell
+
+    for cell, other in edges:
+        cell_root, other_root = find(cell), find(other)
+
+        if cell_root != other_root:
+            root[cell_root] = other_root
+            carve(board, cell, other, cols)
+
+
+def prim(board, rng):
+    # grows one region from a random cell through a random wall on its edge:
+    # lots of short dead ends
+    rows, cols = cell_shape(board)
+    fill_walls(board, rows, cols)
+
+    in_maze = bytearray(rows * cols)
+    walls = []
+
+    def add(cell):
+        in_maze[cell] = 1
+        row, col = divmod(cell, cols)
+
+        for dy, dx in STEPS:
+            if 0 <= row + dy < rows and 0 <= col + dx < cols:
+                walls.append((cell, (row + dy) * cols + col + dx))
+
+    add(rng.randrange(rows * cols))
+
+    while walls:
+        # swap with the last wall, so removing it is O(1)
+        position = rng.randrange(len(walls))
+        walls[position], walls[-1] = walls[-1], walls[position]
+        cell, other = walls.pop()
+
+        if not in_maze[other]:
+            carve(board, cell, other, cols)
+            add(other)
+
+
+def recursive_division(board, rng):
+    # starts with one open room and keeps splitting rooms with a wall that has a
+    # single gap: long straight walls
+    rows, cols = cell_shape(board)
+    board[1:-1, 1:-1] = WALL
+    board[1 : 2 * rows, 1 : 2 * cols] = TILE
+
+    # rooms in cells: top, left, bottom, right, inclusive
+    rooms = [(0, 0, rows - 1, cols - 1)]
+
+    while rooms:
+        top, left, bottom, right = rooms.pop()
+        height, width = bottom - top + 1, right - left + 1
+
+        if height < 2 or width < 2:
+            continue
+
+        if height > width or (height == width and rng.random() < 0.5):
+            split = rng.randrange(top, bottom)
+            gap = rng.randrange(left, right + 1)
+
+            board[2 * split + 2, 2 * left + 1 : 2 * right + 2] = WALL
+            board[2 * split + 2, 2 * gap + 1] = TILE
+
+            rooms.append((top, left, split, right))
+            rooms.append((split + 1, left, bottom, right))
+        else:
+            split = rng.randrange(left, right)
+            gap = rng.randrange(top, bottom + 1)
+
+            board[2 * top + 1 : 2 * bottom + 2, 2 * split + 2] = WALL
+            board[2 * gap + 1, 2 * split + 2] = TILE
+
+            rooms.append((top, left, bottom, split))
+            rooms.append((top, split + 1, bottom, right))
+
+
+GENERATORS = {
+    "recursive_backtracker": recursive_backtracker,
+    "kruskal": kruskal,
+    "prim": prim,
+    "recursive_division": recursive_division,
+}
+
+
+def generate_maze(board, generator="recursive_backtracker", seed=None):
+    # fills the inside of a board surrounded by BORDER_WALL with a maze, the same
+    # seed always gives the same maze
+    if generator not in GENERATORS:
+        raise ValueError(f"Unknown maze generator: {generator}")
+
+    rows, cols = cell_shape(board)
+    GENERATORS[generator](board, random.Random(seed))
+
+    # opposite corners, as far apart as the maze allows
+    board[1, 1] = START
+    board[2 * rows - 1, 2 * cols - 1] = END
+
+    touch(board)
+    return board
@@ -0,0 +1,142 @@
+import hashlib
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from algorithms import SearchResult
+from batch import ALGORITHMS
+from board import board_version
+from components import unreachable_result
+
+# every entry costs its path plus roughly this much for the key and bookkeeping
+ENTRY_OVERHEAD = 256
+
+# content hash of every array seen, by id: (version it was hashed at, hash)
+content_hashes = {}
+
+
+def content_hash(array):
+    # hashes the whole array only when it changed through set_tile or touch
+    # since the last time, edits made by writing into it directly aren't seen
+    key = id(array)
+    version = board_version(array)
+    cached = content_hashes.get(key)
+
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    if cached is None:
+        weakref.finalize(array, content_hashes.pop, key, None)
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.shape}{array.dtype.str}".encode())
+    digest.update(np.ascontiguousarray(array).data)
+
+    content_hashes[key] = (version, digest.hexdigest())
+    return content_hashes[key][1]
+
+
+def option_key(value):
+    # arrays in the options (e.g. terrain costs) go into the key by content
+    if isinstance(value, np.ndarray):
+        return content_hash(value)
+    return value
+
+
+class PathCache:
+    # least recently used paths of repeated queries, bounded by the memory the
+    # paths take. A hit returns a SearchResult with the stored path and cost and
+    # nothing expanded
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, board, start, end, algorithm, move_diagonally, options):
+        return (
+            content_hash(board),
+            None if start is None else tuple(map(int, start)),
+            None if end is None else tuple(map(int, end)),
+            algorithm,
+            bool(move_diagonally),
+            tuple(sorted((name, option_key(value)) for name, value in options.items())),
+        )
+
+    def find_path(
+        self,
+        board,
+        start=None,
+        end=None,
+        algorithm="a_star_search",
+        move_diagonally=False,
+        **options,
+    ):
+        # start and end default to the START and END tiles on the board
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+
+        key = self.key(board, start, end, algorithm, move_diagonally, options)
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+
+            path, cost = entry
+            cols = board.shape[1]
+            path = [divmod(index, cols) for index in path.tolist()]
+            return SearchResult(board.shape, path, np.empty(0, np.int32), cost)
+
+        self.misses += 1
+
+        result = unreachable_result(board, start, end, move_diagonally)
+        if result is not None:
+            self.put(key, np.empty(0, np.int32), result.cost)
+            return result
+
+        result = ALGORITHMS[algorithm](
+            board, start=start, end=end, move_diagonally=move_diagonally, **options
+        )
+
+        # flat indices take a lot less memory than a list of tuples
+        path = np.array(
+            [row * board.shape[1] + col for row, col in result.path], dtype=np.int32
+        )
+        self.put(key, path, result.cost)
+
+        return result
+
+    def put(self, key, path, cost):
+        size = path.nbytes + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+
+        self.entries[key] = (path, cost)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes:
+            _, (old_path, _) = self.entries.popitem(last=False)
+            self.bytes -= old_path.nbytes + ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def cache_info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
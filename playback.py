@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class Playback:
+    # replays the expansion trace of a finished search, independent of how long
+    # the search itself took. The rate is one of:
+    #   steps_per_frame - a fixed number of expansions per frame
+    #   duration        - the whole trace in about that many seconds
+    #   neither         - adaptive, as many expansions as fit in the frame budget
+    def __init__(self, result, steps_per_frame=None, duration=None, fps=60):
+        self.expanded = result.expanded
+        self.sides = result.sides
+        if self.sides is None:
+            self.sides = np.zeros(len(self.expanded), dtype=np.int8)
+
+        self.total = len(self.expanded)
+        self.fps = fps
+
+        self.steps_per_frame = steps_per_frame
+        self.duration = duration
+        self.batch = 1.0
+
+        self.speed = 1.0
+        self.paused = False
+        # fractional, so slow speeds still move on every few frames
+        self.position = 0.0
+
+    @property
+    def shown(self):
+        return int(self.position)
+
+    @property
+    def finished(self):
+        return self.shown >= self.total
+
+    def frame_steps(self, work_time):
+        if self.duration is not None:
+            return self.total / max(self.duration * self.fps, 1)
+
+        if self.steps_per_frame is not None:
+            return self.steps_per_frame
+
+        # grow the batch while drawing it leaves most of the frame free, shrink it
+        # when drawing gets close to the whole frame
+        budget = 1 / self.fps
+        if work_time < budget * 0.5:
+            self.batch *= 1.25
+        elif work_time > budget * 0.9:
+            self.batch = max(1.0, self.batch * 0.8)
+
+        return self.batch
+
+    def advance(self, work_time=0.0):
+        # moves on by one frame, work_time is how long drawing the last frame took
+        if not self.paused and not self.finished:
+            steps = self.frame_steps(work_time) * self.speed
+            self.position = min(float(self.total), self.position + steps)
+
+        return self.shown
+
+    def seek(self, position):
+        self.position = float(min(max(position, 0), self.total))
+        return self.shown
+
+    def scrub(self, steps):
+        return self.seek(self.shown + steps)
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def faster(self):
+        self.speed = min(self.speed * 2, 64.0)
+
+    def slower(self):
+        self.speed = max(self.speed / 2, 1 / 64)
@@ -0,0 +1,146 @@
+import heapq
+from itertools import count
+
+INF = float("inf")
+# above this many tiles the priorities go in a dict, a list would take 8 bytes
+# for every tile of the board
+DENSE_SIZE = 1 << 24
+
+
+class HeapQueue:
+    # open list for single-threaded solves, without the lock queue.PriorityQueue takes
+    def __init__(self, size):
+        self.heap = []
+        # the priority each tile was last put with; older entries are stale
+        self.priority = [INF] * size if size <= DENSE_SIZE else {}
+        self.counter = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def put(self, priority, index, tie=None):
+        # ties are broken by `tie` (e.g. the heuristic) and then by insertion order,
+        # so the tile indices themselves are never compared
+        if tie is None:
+            tie = 0
+
+        self.priority[index] = priority
+        heapq.heappush(self.heap, (priority, tie, next(self.counter), index))
+
+    def discard_stale(self):
+        heap = self.heap
+        priority = self.priority
+
+        while heap and heap[0][0] != priority[heap[0][3]]:
+            heapq.heappop(heap)
+
+    def empty(self):
+        self.discard_stale()
+        return len(self.heap) == 0
+
+    def peek(self):
+        self.discard_stale()
+        return self.heap[0][0]
+
+    def get(self):
+        self.discard_stale()
+        priority, _, _, index = heapq.heappop(self.heap)
+        # a tile popped once won't be popped again unless it's put back
+        self.priority[index] = INF
+        return priority, index
+
+
+class DecreaseKeyQueue:
+    # binary heap which moves an entry in place instead of pushing a duplicate
+    def __init__(self, size):
+        self.heap = []
+        self.keys = [None] * size
+        # slot of every tile in the heap, -1 when it isn't in there
+        self.slot = [-1] * size
+        self.counter = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def put(self, priority, index, tie=None):
+        if tie is None:
+            tie = 0
+
+        key = (priority, tie, next(self.counter))
+        position = self.slot[index]
+
+        if position == -1:
+            self.heap.append(index)
+            self.keys[index] = key
+            self.sift_up(len(self.heap) - 1)
+
+        elif key < self.keys[index]:
+            self.keys[index] = key
+            self.sift_up(position)
+
+    def empty(self):
+        return len(self.heap) == 0
+
+    def peek(self):
+        return self.keys[self.heap[0]][0]
+
+    def get(self):
+        heap = self.heap
+        index = heap[0]
+        last = heap.pop()
+
+        if heap:
+            heap[0] = last
+            self.slot[last] = 0
+            self.sift_down(0)
+
+        self.slot[index] = -1
+        return self.keys[index][0], index
+
+    def sift_up(self, position):
+        heap, keys, slot = self.heap, self.keys, self.slot
+        index = heap[position]
+        key = keys[index]
+
+        while position > 0:
+            parent_position = (position - 1) >> 1
+            parent = heap[parent_position]
+
+            if key >= keys[parent]:
+                break
+
+            heap[position] = parent
+            slot[parent] = position
+            position = parent_position
+
+        heap[position] = index
+        slot[index] = position
+
+    def sift_down(self, position):
+        heap, keys, slot = self.heap, self.keys, self.slot
+        length = len(heap)
+        index = heap[position]
+        key = keys[index]
+
+        while True:
+            child_position = 2 * position + 1
+            if child_position >= length:
+                break
+
+            right_position = child_position + 1
+            if (
+                right_position < length
+                and keys[heap[right_position]] < keys[heap[child_position]]
+            ):
+                child_position = right_position
+
+            child = heap[child_position]
+            if keys[child] >= key:
+                break
+
+            heap[position] = child
+            slot[child] = position
+            position = child_position
+
+        heap[position] = index
+        slot[index] = position
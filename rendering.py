@@ -0,0 +1,368 @@
+import numpy as np
+import pygame
+
+from board import BORDER_WALL, END, START, TILE, WALL
+
+COLORS = {
+    "BG_COLOR": (255, 255, 255),
+    "TILE_COLOR": (210, 210, 210),
+    "WALL_COLOR": (128, 128, 128),
+    "TEXT_BG_COLOR": (150, 150, 150),
+    "TEXT_COLOR": (0, 0, 0),
+    "GREEN": (0, 255, 0),
+    "ORANGE": (255, 165, 0),
+    "BLUE": (100, 149, 237),
+    "RED": (255, 0, 0),
+    "TERRAIN_COLOR": (139, 90, 43),
+}
+
+# tiles fade from TILE_COLOR to TERRAIN_COLOR as their cost goes up to this
+MAX_TERRAIN_COST = 9
+
+# what the algorithm did with a tile, drawn on top of the static board
+EMPTY = 0
+VISITED = 1
+VISITED_BACKWARD = 2
+PATH = 3
+
+STATE_COLORS = {
+    VISITED: COLORS["ORANGE"],
+    VISITED_BACKWARD: COLORS["BLUE"],
+    PATH: COLORS["GREEN"],
+}
+
+# colour of every board value (TILE, WALL, START, END, BORDER_WALL) followed by
+# the colour of every state, offset by STATE_OFFSET
+PALETTE = np.array(
+    [
+        COLORS["TILE_COLOR"],
+        COLORS["WALL_COLOR"],
+        COLORS["GREEN"],
+        COLORS["RED"],
+        COLORS["WALL_COLOR"],
+        COLORS["ORANGE"],
+        COLORS["BLUE"],
+        COLORS["GREEN"],
+    ],
+    dtype=np.uint8,
+)
+STATE_OFFSET = BORDER_WALL
+
+# when several tiles share one pixel, the pixel shows the most important of them,
+# so thin walls and paths don't disappear on boards bigger than the window
+# START and END rank above every state, so they stay visible under the trace
+CODE_RANKS = np.array([0, 1, 6, 5, 1, 2, 3, 4], dtype=np.uint8)
+RANKED_CODES = np.array([0, 1, 5, 6, 7, 3, 2], dtype=np.uint8)
+# rank of every state, EMPTY included
+STATE_RANKS = np.array([0, 2, 3, 4], dtype=np.uint8)
+
+# below this many pixels per tile the whole board is drawn as one image
+ARRAY_TILE_SIZE = 4
+# below this many pixels per tile there's no room for the O and X glyphs
+GLYPH_TILE_SIZE = 8
+
+
+def terrain_colors(costs):
+    shade = np.clip((costs - 1) / (MAX_TERRAIN_COST - 1), 0, 1)[..., None]
+    colors = (1 - shade) * COLORS["TILE_COLOR"] + shade * COLORS["TERRAIN_COLOR"]
+    return colors.astype(np.uint8)
+
+
+def region_colors(labels):
+    # a colour for every connected region, from a hash of its label, mixed with
+    # TILE_COLOR so the regions stay lighter than the walls and the trace
+    hashed = labels.astype(np.uint32) * np.uint32(2654435761)
+    colors = np.stack([(hashed >> shift) & 0xFF for shift in (8, 16, 24)], axis=-1)
+    return ((colors + COLORS["TILE_COLOR"]) // 2).astype(np.uint8)
+
+
+def block_max(ranks, block_rows, block_cols):
+    rows, cols = ranks.shape
+    ranks = np.pad(ranks, ((0, -rows % block_rows), (0, -cols % block_cols)))
+    ranks = ranks.reshape(
+        ranks.shape[0] // block_rows,
+        block_rows,
+        ranks.shape[1] // block_cols,
+        block_cols,
+    )
+    return ranks.max(axis=(1, 3))
+
+
+def tile_pixels(tiles, tile_size, pixels):
+    # how many pixels every tile along one side covers, with the tiles starting
+    # on the same rounded pixels as in tile_rect
+    starts = (np.arange(tiles) * tile_size).astype(np.int64)
+    return np.diff(starts, append=pixels)
+
+
+class BoardRenderer:
+    # draws the board in one of two ways:
+    #  - tiles: the static board is cached on a surface and only tiles whose state
+    #    changed are redrawn, so a step costs O(changed tiles)
+    #  - array: the whole board goes through a palette lookup into one RGB image,
+    #    which is blitted and scaled in one call; used for boards with tiny tiles
+    #    and for boards which are still being edited
+    def __init__(
+        self, window, board, use_array=None, editable=False, costs=None, regions=None
+    ):
+        self.window = window
+        self.board = board
+        # terrain costs, tiles costing more than 1 are drawn darker
+        self.costs = costs
+        # labels of the connected regions (see components.py), every region is
+        # drawn in its own colour; can be changed between frames in array mode
+        self.regions = regions
+        # the board itself can change between frames, not only the tile states
+        self.editable = editable
+
+        rows, cols = board.shape
+        width, height = window.get_size()
+        self.tile_width = width / cols
+        self.tile_height = height / rows
+
+        tile_size = min(self.tile_width, self.tile_height)
+        self.use_array = tile_size < ARRAY_TILE_SIZE if use_array is None else use_array
+
+        self.font = pygame.font.SysFont(None, max(int(tile_size), 1))
+        self.glyphs = {
+            START: self.font.render("O", True, COLORS["TEXT_COLOR"]),
+            END: self.font.render("X", True, COLORS["TEXT_COLOR"]),
+        }
+
+        self.state = np.zeros(board.shape, dtype=np.uint8)
+        self.dirty = []
+        self.changed = False
+
+        if self.use_array:
+            # boards with more tiles than pixels are shrunk by whole blocks of tiles
+            self.block = (-(-rows // height), -(-cols // width))
+            image_rows = -(-rows // self.block[0])
+            image_cols = -(-cols // self.block[1])
+
+            # surfarray works on (width, height), so the image is the board transposed
+            self.image = pygame.Surface((image_cols, image_rows))
+            self.scaled = pygame.Surface((width, height))
+
+            # with room for the grid lines, the image is scaled with the rounding
+            # of tile_rect rather than the one of transform.scale, so it lines up
+            # with the gaps between the tiles
+            self.tile_pixels = None
+            if tile_size >= ARRAY_TILE_SIZE:
+                self.tile_pixels = (
+                    tile_pixels(cols, self.tile_width, width),
+                    tile_pixels(rows, self.tile_height, height),
+                )
+
+            # a shrunk board keeps the rank of every pixel, for the board and for
+            # the states separately, so a frame doesn't go over the whole board
+            if self.block != (1, 1):
+                self.board_ranks = block_max(CODE_RANKS[board], *self.block)
+                self.state_ranks = np.zeros((image_rows, image_cols), dtype=np.uint8)
+                self.stale_state_ranks = False
+        else:
+            self.background = self.draw_background()
+
+    def tile_rect(self, row, col):
+        x = int(col * self.tile_width)
+        y = int(row * self.tile_height)
+        return pygame.Rect(x, y, int(self.tile_width) - 1, int(self.tile_height) - 1)
+
+    def tile_color(self, row, col):
+        value = self.board[row, col]
+
+        if value == START:
+            return COLORS["GREEN"]
+
+        state = self.state[row, col]
+        if state != EMPTY:
+            return STATE_COLORS[state]
+
+        if value == WALL or value == BORDER_WALL:
+            return COLORS["WALL_COLOR"]
+
+        if value == END:
+            return COLORS["RED"]
+
+        if self.regions is not None and value == TILE:
+            return tuple(region_colors(self.regions[row, col]).tolist())
+
+        if self.costs is not None and self.costs[row, col] > 1:
+            return tuple(terrain_colors(self.costs[row, col]).tolist())
+
+        return COLORS["TILE_COLOR"]
+
+    def draw_tile(self, surface, row, col):
+        rect = self.tile_rect(row, col)
+        pygame.draw.rect(surface, self.tile_color(row, col), rect)
+
+        glyph = self.glyphs.get(self.board[row, col])
+        tile_size = min(self.tile_width, self.tile_height)
+        if glyph is not None and tile_size >= GLYPH_TILE_SIZE:
+            surface.blit(glyph, glyph.get_rect(center=rect.center))
+
+        return rect
+
+    def draw_background(self):
+        background = pygame.Surface(self.window.get_size())
+        background.fill(COLORS["BG_COLOR"])
+
+        rows, cols = self.board.shape
+        for row in range(rows):
+            for col in range(cols):
+                self.draw_tile(background, row, col)
+
+        return background
+
+    def draw_array(self):
+        state = self.state
+        board = self.board
+
+        if self.block == (1, 1):
+            # START keeps its colour under the trace, like in the tiles mode
+            codes = np.where(
+                (state != EMPTY) & (board != START), state + STATE_OFFSET, board
+            )
+            colors = PALETTE.take(codes.T, axis=0)
+
+            if self.costs is not None:
+                costs = self.costs.T
+                terrain = (codes.T == TILE) & (costs > 1)
+                colors[terrain] = terrain_colors(costs[terrain])
+
+            if self.regions is not None:
+                tiles = codes.T == TILE
+                colors[tiles] = region_colors(self.regions.T[tiles])
+        else:
+            if self.editable:
+                self.board_ranks = block_max(CODE_RANKS[board], *self.block)
+            if self.stale_state_ranks:
+                self.state_ranks = block_max(STATE_RANKS[state], *self.block)
+                self.stale_state_ranks = False
+
+            # terrain doesn't get a rank, a shrunk board only shows the walls
+            codes = RANKED_CODES[np.maximum(self.board_ranks, self.state_ranks)]
+            colors = PALETTE.take(codes.T, axis=0)
+
+            # a pixel with only tiles takes the region of the first one
+            if self.regions is not None:
+                regions = self.regions[:: self.block[0], :: self.block[1]].T
+                tiles = (codes.T == TILE) & (regions != -1)
+                colors[tiles] = region_colors(regions[tiles])
+
+        if self.tile_pixels is not None:
+            # repeated as the surface's own pixel values, a third of the bytes
+            col_pixels, row_pixels = self.tile_pixels
+            pixels = pygame.surfarray.map_array(self.scaled, colors)
+            pixels = np.repeat(
+                np.repeat(pixels, col_pixels, axis=0), row_pixels, axis=1
+            )
+            pygame.surfarray.blit_array(self.scaled, pixels)
+        else:
+            pygame.surfarray.blit_array(self.image, colors)
+            pygame.transform.scale(self.image, self.window.get_size(), self.scaled)
+
+        self.window.blit(self.scaled, (0, 0))
+
+        if min(self.tile_width, self.tile_height) >= ARRAY_TILE_SIZE:
+            self.draw_grid_lines()
+
+        if min(self.tile_width, self.tile_height) >= GLYPH_TILE_SIZE:
+            for value, glyph in self.glyphs.items():
+                for index in np.flatnonzero(board == value).tolist():
+                    rect = self.tile_rect(*divmod(index, board.shape[1]))
+                    self.window.blit(glyph, glyph.get_rect(center=rect.center))
+
+    def draw_grid_lines(self):
+        # the gaps tile_rect leaves after every tile: one pixel wide, or two
+        # where the rounded tile edges jump by one more than the tile size
+        rows, cols = self.board.shape
+        width, height = self.window.get_size()
+        tile_width, tile_height = int(self.tile_width), int(self.tile_height)
+
+        for row in range(rows):
+            y = int(row * self.tile_height) + tile_height - 1
+            gap = int((row + 1) * self.tile_height) - y
+            self.window.fill(COLORS["BG_COLOR"], pygame.Rect(0, y, width, gap))
+
+        for col in range(cols):
+            x = int(col * self.tile_width) + tile_width - 1
+            gap = int((col + 1) * self.tile_width) - x
+            self.window.fill(COLORS["BG_COLOR"], pygame.Rect(x, 0, gap, height))
+
+    def draw(self):
+        # the whole frame, without pushing it to the display
+        if self.use_array:
+            self.draw_array()
+        else:
+            self.window.blit(self.background, (0, 0))
+            rows, cols = np.nonzero(self.state)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                self.draw_tile(self.window, row, col)
+
+        self.dirty = []
+        self.changed = False
+
+    def show(self):
+        # draws the whole board once, later frames only touch what changed
+        self.state[:] = EMPTY
+        if self.use_array and self.block != (1, 1):
+            self.state_ranks[:] = 0
+            self.stale_state_ranks = False
+
+        self.draw()
+        pygame.display.update()
+
+    def set_tiles(self, positions, state):
+        if self.use_array:
+            positions = list(positions)
+            if positions:
+                rows, cols = zip(*positions)
+                indices = np.ravel_multi_index((rows, cols), self.board.shape)
+                self.set_indices(indices, state)
+            return
+
+        for row, col in positions:
+            if self.state[row, col] == state:
+                continue
+
+            self.state[row, col] = state
+            # the background already has the gap between tiles, only the tile changes
+            self.dirty.append(self.draw_tile(self.window, row, col))
+
+    def set_indices(self, indices, state):
+        if self.use_array:
+            if len(indices) == 0:
+                return
+
+            flat_state = self.state.reshape(-1)
+
+            if self.block != (1, 1) and not self.stale_state_ranks:
+                rank = STATE_RANKS[state]
+
+                # a tile getting less important can lower its pixel, which only a
+                # recount of the whole block can tell
+                if STATE_RANKS[flat_state[indices]].max() > rank:
+                    self.stale_state_ranks = True
+                else:
+                    rows, cols = np.divmod(indices, self.board.shape[1])
+                    pixels = (rows // self.block[0], cols // self.block[1])
+                    self.state_ranks[pixels] = np.maximum(
+                        self.state_ranks[pixels], rank
+                    )
+
+            flat_state[indices] = state
+            self.changed = True
+            return
+
+        rows, cols = np.unravel_index(indices, self.board.shape)
+        self.set_tiles(zip(rows.tolist(), cols.tolist()), state)
+
+    def update(self):
+        if self.use_array:
+            if self.changed:
+                self.draw()
+                pygame.display.update()
+
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+            self.dirty = []
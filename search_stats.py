@@ -0,0 +1,203 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# seconds between two samples of the sampling profiler
+SAMPLE_INTERVAL = 0.001
+
+
+class SearchStats:
+    # counters of one solve. The searches only look at them when they're given a
+    # SearchStats, which swaps their grid, open list and on_expand for the
+    # watched versions below; without one the loops run exactly as before
+    def __init__(self):
+        self.expansions = 0
+        self.neighbor_checks = 0
+        self.pushes = 0
+        self.pops = 0
+        self.max_frontier = 0
+
+        self.neighbor_seconds = 0.0
+        self.queue_seconds = 0.0
+        self.draw_seconds = 0.0
+        self.total_seconds = 0.0
+
+        # pstats.Stats of a profiled solve, or the number of samples per function
+        self.profile = None
+        self.samples = None
+
+    def instrument(self, grid, queue=None, on_expand=None):
+        # the watched versions of whatever the search uses
+        grid = WatchedGrid(grid, self)
+
+        if queue is not None:
+            queue = self.watch_queue(queue)
+
+        if on_expand is not None:
+            on_expand = self.watch_drawing(on_expand)
+
+        return grid, queue, on_expand
+
+    def watch_queue(self, queue):
+        return WatchedQueue(queue, self)
+
+    def watch_drawing(self, on_expand):
+        if on_expand is None:
+            return None
+
+        def watched(*args):
+            start = time.perf_counter()
+            on_expand(*args)
+            self.draw_seconds += time.perf_counter() - start
+
+        return watched
+
+    @property
+    def other_seconds(self):
+        # time spent in the search loop itself
+        return self.total_seconds - (
+            self.neighbor_seconds + self.queue_seconds + self.draw_seconds
+        )
+
+    def as_dict(self):
+        return {
+            "expansions": self.expansions,
+            "neighbor_checks": self.neighbor_checks,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "max_frontier": self.max_frontier,
+            "neighbor_seconds": round(self.neighbor_seconds, 6),
+            "queue_seconds": round(self.queue_seconds, 6),
+            "draw_seconds": round(self.draw_seconds, 6),
+            "other_seconds": round(self.other_seconds, 6),
+            "total_seconds": round(self.total_seconds, 6),
+        }
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"SearchStats({fields})"
+
+
+class WatchedGrid:
+    # a Grid which counts and times the neighbor lookups, everything else goes
+    # straight to the grid
+    def __init__(self, grid, stats):
+        self.grid = grid
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.grid, name)
+
+    def neighbors(self, index):
+        start = time.perf_counter()
+        neighbors = self.grid.neighbors(index)
+        self.stats.neighbor_seconds += time.perf_counter() - start
+        self.stats.neighbor_checks += len(self.grid.offsets)
+        return neighbors
+
+    def edges(self, index):
+        start = time.perf_counter()
+        edges = self.grid.edges(index)
+        self.stats.neighbor_seconds += time.perf_counter() - start
+        self.stats.neighbor_checks += len(self.grid.offsets)
+        return edges
+
+
+class WatchedQueue:
+    # an open list (HeapQueue, DecreaseKeyQueue) or a deque, with every push and
+    # pop counted and timed
+    def __init__(self, queue, stats):
+        self.queue = queue
+        self.stats = stats
+
+    def __len__(self):
+        return len(self.queue)
+
+    def timed(self, method, *args):
+        start = time.perf_counter()
+        value = method(*args)
+        self.stats.queue_seconds += time.perf_counter() - start
+        return value
+
+    def pushed(self, method, *args):
+        self.timed(method, *args)
+        self.stats.pushes += 1
+        self.stats.max_frontier = max(self.stats.max_frontier, len(self.queue))
+
+    def popped(self, method):
+        self.stats.pops += 1
+        return self.timed(method)
+
+    def put(self, *args):
+        self.pushed(self.queue.put, *args)
+
+    def append(self, item):
+        self.pushed(self.queue.append, item)
+
+    def get(self):
+        return self.popped(self.queue.get)
+
+    def pop(self):
+        return self.popped(self.queue.pop)
+
+    def popleft(self):
+        return self.popped(self.queue.popleft)
+
+    def empty(self):
+        return self.timed(self.queue.empty)
+
+    def peek(self):
+        return self.timed(self.queue.peek)
+
+
+def sample_frames(thread_id, samples, stop):
+    # the innermost function the solving thread is in, every SAMPLE_INTERVAL
+    while not stop.wait(SAMPLE_INTERVAL):
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            code = frame.f_code
+            samples[f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"] += 1
+
+
+def solve(algorithm, board, profile=None, **options):
+    # runs one of the searches with its counters on, the result gets them as
+    # result.stats. profile: None, "cprofile" or "sample"
+    if profile not in (None, "cprofile", "sample"):
+        raise ValueError(f"Unknown profiler: {profile}")
+
+    stats = SearchStats()
+    profiler = None
+    sampler = None
+
+    if profile == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profile == "sample":
+        stats.samples = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=sample_frames,
+            args=(threading.get_ident(), stats.samples, stop),
+            daemon=True,
+        )
+        sampler.start()
+
+    start = time.perf_counter()
+    try:
+        result = algorithm(board, stats=stats, **options)
+    finally:
+        stats.total_seconds = time.perf_counter() - start
+
+        if profiler is not None:
+            profiler.disable()
+            stats.profile = pstats.Stats(profiler)
+        if sampler is not None:
+            stop.set()
+            sampler.join()
+
+    stats.expansions = len(result.expanded)
+    result.stats = stats
+    return result
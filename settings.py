@@ -4,18 +4,25 @@ import tkinter as tk
 main_font = ("Arial", 14)
 smaller_font = ("Arial", 12, "italic")
 
+# boards of up to 10000x10000 tiles, a uint8 board that big takes 100 MB
+MAX_BOARD_SIZE = 10_000
+
 
 def start_algorithm(
     root, width, height, is_show_process, choose_algorithm, is_draw_maze
 ):
-    if choose_algorithm != "file":
+    if is_draw_maze != "file":
         try:
             width = int(width)
             height = int(height)
         except:
             return
 
-        if width < 2 or width > 50 or height < 2 or height > 50:
+        if width < 2 or width > MAX_BOARD_SIZE or height < 2 or height > MAX_BOARD_SIZE:
+            return
+
+        # a maze needs two cells with a wall between them
+        if is_draw_maze == "generate" and width < 3 and height < 3:
             return
 
         height = int(height)
@@ -100,6 +107,38 @@ def settings():
         font=smaller_font,
     ).grid(row=7, column=0, padx=10, pady=10, sticky=tk.W)
 
+    tk.Radiobutton(
+        root,
+        text="Jump point search",
+        variable=choose_algorithm,
+        value="jump_point_search",
+        font=smaller_font,
+    ).grid(row=4, column=1, padx=10, pady=10, sticky=tk.W)
+
+    tk.Radiobutton(
+        root,
+        text="Bidirectional breadth first search",
+        variable=choose_algorithm,
+        value="bidirectional_breadth_first_search",
+        font=smaller_font,
+    ).grid(row=5, column=1, padx=10, pady=10, sticky=tk.W)
+
+    tk.Radiobutton(
+        root,
+        text="Bidirectional A* algorithm",
+        variable=choose_algorithm,
+        value="bidirectional_a_star_search",
+        font=smaller_font,
+    ).grid(row=6, column=1, padx=10, pady=10, sticky=tk.W)
+
+    tk.Radiobutton(
+        root,
+        text="Wavefront search",
+        variable=choose_algorithm,
+        value="wavefront_search",
+        font=smaller_font,
+    ).grid(row=7, column=1, padx=10, pady=10, sticky=tk.W)
+
     # show process
     tk.Label(
         text="Would you like to see the algorithm or just the end result?",
@@ -133,7 +172,7 @@ def settings():
 
     is_draw_maze = tk.StringVar(
         value="randomize"
-    )  # randomize - random maze, draw - user draws the maze, file - random maze from a file
+    )  # randomize - random maze, generate - generated maze, draw - user draws the maze, file - random maze from a file
 
     tk.Radiobutton(
         root,
@@ -143,6 +182,14 @@ def settings():
         font=smaller_font,
     ).grid(row=12, column=0, padx=10, pady=10, sticky=tk.W)
 
+    tk.Radiobutton(
+        root,
+        text="Generate a proper maze",
+        variable=is_draw_maze,
+        value="generate",
+        font=smaller_font,
+    ).grid(row=12, column=1, padx=10, pady=10, sticky=tk.W)
+
     tk.Radiobutton(
         root,
         text="Let me draw the maze",
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+
+from board import BORDER_WALL, END, START, TILE, WALL
+
+SEEDS = range(25)
+
+
+def random_board(seed, size=None, density=None):
+    # a square board with walls at random, START and END on two tiles which
+    # may be walls underneath and may be cut off from each other
+    rng = np.random.default_rng(seed)
+    size = int(rng.integers(2, 30)) if size is None else size
+    density = rng.choice([0.0, 0.1, 0.25, 0.4]) if density is None else density
+
+    board = np.full((size + 2, size + 2), TILE, dtype=np.uint8)
+    board[0, :] = board[-1, :] = board[:, 0] = board[:, -1] = BORDER_WALL
+    interior = board[1:-1, 1:-1]
+    interior[rng.random(interior.shape) < density] = WALL
+
+    start, end = rng.integers(1, size + 1, (2, 2))
+    board[tuple(start)] = START
+    board[tuple(end)] = END
+    return board
+
+
+def position(board, value):
+    return tuple(int(i) for i in np.argwhere(board == value)[0])
+
+
+def path_cost(board, path, move_diagonally):
+    # the cost of a path which goes from START to END one step at a time over
+    # walkable tiles, asserted along the way
+    assert path[0] == position(board, START)
+    assert path[-1] == position(board, END)
+
+    cost = 0.0
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        dy, dx = abs(next_row - row), abs(next_col - col)
+
+        assert max(dy, dx) == 1
+        assert move_diagonally or dy + dx == 1
+        assert board[next_row, next_col] not in (WALL, BORDER_WALL)
+
+        cost += math.hypot(dy, dx)
+
+    return cost
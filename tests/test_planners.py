@@ -0,0 +1,105 @@
+import math
+
+import numpy as np
+import pytest
+from helpers import SEEDS, path_cost, random_board
+
+from algorithms import dijkstra_search
+from board import TILE, WALL, set_tile
+from hierarchical import HierarchicalPlanner
+from incremental import LifelongPlanner
+
+
+@pytest.mark.parametrize("move_diagonally", [False, True])
+def test_lifelong_planner_after_edits(move_diagonally):
+    for seed in SEEDS:
+        rng = np.random.default_rng(seed)
+        board = random_board(seed, size=int(rng.integers(5, 30)))
+        planner = LifelongPlanner(board, move_diagonally)
+
+        # the first plan is a whole search, the ones after it only repair it
+        for _ in range(6):
+            expected = dijkstra_search(board, move_diagonally=move_diagonally)
+            result = planner.plan()
+
+            assert result.found == expected.found, seed
+            if result.found:
+                assert math.isclose(result.cost, expected.cost), seed
+                cost = path_cost(board, result.path, move_diagonally)
+                assert math.isclose(cost, expected.cost), seed
+
+            for row, col in rng.integers(1, board.shape[0] - 1, (4, 2)):
+                if board[row, col] in (TILE, WALL):
+                    set_tile(
+                        board, (row, col), WALL if board[row, col] == TILE else TILE
+                    )
+
+
+# a board where diagonal routes of the same length once added up to different
+# floats, which ended a plan before the distances settled
+DIAGONAL_BOARD = [
+    "4444444444",
+    "4000000304",
+    "4001010004",
+    "4000001004",
+    "4200000004",
+    "4000000104",
+    "4100000004",
+    "4001001104",
+    "4010001004",
+    "4444444444",
+]
+DIAGONAL_EDITS = [
+    [(5, 7), (3, 4), (2, 3), (8, 4), (1, 4), (3, 3)],
+    [(3, 3), (2, 2), (5, 2), (5, 8), (5, 7), (1, 2)],
+    [(8, 1), (6, 6)],
+    [(7, 7), (1, 5), (4, 4)],
+]
+
+
+def test_lifelong_planner_equal_diagonal_routes():
+    board = np.array([[int(tile) for tile in row] for row in DIAGONAL_BOARD], np.uint8)
+    planner = LifelongPlanner(board, True)
+
+    for edits in [[], *DIAGONAL_EDITS]:
+        for pos in edits:
+            set_tile(board, pos, WALL if board[pos] == TILE else TILE)
+
+        expected = dijkstra_search(board, move_diagonally=True)
+        result = planner.plan()
+        assert math.isclose(result.cost, expected.cost)
+        assert math.isclose(path_cost(board, result.path, True), expected.cost)
+
+
+def test_hierarchical_planner_paths():
+    for seed in SEEDS:
+        board = random_board(seed, size=40)
+        expected = dijkstra_search(board)
+
+        for cluster_size in (4, 8, 32):
+            result = HierarchicalPlanner(board, cluster_size).find_path()
+
+            assert result.found == expected.found, seed
+            if result.found:
+                # close to the shortest path, never shorter
+                cost = path_cost(board, result.path, False)
+                assert cost == result.cost
+                assert cost >= expected.cost
+
+
+def test_hierarchical_planner_after_edits():
+    rng = np.random.default_rng(0)
+    board = random_board(0, size=40, density=0.2)
+    planner = HierarchicalPlanner(board, 8)
+
+    for _ in range(20):
+        for row, col in rng.integers(1, 41, (10, 2)):
+            if board[row, col] in (TILE, WALL):
+                set_tile(board, (row, col), WALL if board[row, col] == TILE else TILE)
+
+        expected = dijkstra_search(board)
+        result = planner.find_path()
+
+        assert result.found == expected.found
+        if result.found:
+            assert path_cost(board, result.path, False) >= expected.cost
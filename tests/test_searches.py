@@ -0,0 +1,82 @@
+import math
+
+import pytest
+from helpers import SEEDS, path_cost, random_board
+
+from algorithms import dijkstra_search
+from batch import ALGORITHMS
+from board import load_maze_from_file
+from components import ComponentIndex
+from distances import build_landmarks
+
+# the searches which count steps rather than their lengths, with diagonal moves
+# they find the fewest steps instead of the shortest path
+STEP_COUNTING = [
+    "breadth_first_search",
+    "bidirectional_breadth_first_search",
+    "wavefront_search",
+]
+
+
+@pytest.mark.parametrize("move_diagonally", [False, True])
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_search_agrees_with_dijkstra(algorithm, move_diagonally):
+    for seed in SEEDS:
+        board = random_board(seed)
+        expected = dijkstra_search(board, move_diagonally=move_diagonally)
+        result = ALGORITHMS[algorithm](board, move_diagonally=move_diagonally)
+
+        assert result.found == expected.found, seed
+        if not result.found:
+            assert result.path == []
+            continue
+
+        cost = path_cost(board, result.path, move_diagonally)
+
+        if algorithm == "depth_first_search":
+            # any path will do
+            assert cost >= expected.cost - 1e-9
+        elif algorithm in STEP_COUNTING and move_diagonally:
+            assert result.cost == len(result.path) - 1
+            assert cost >= expected.cost - 1e-9
+        else:
+            assert math.isclose(result.cost, expected.cost), seed
+            assert math.isclose(cost, expected.cost), seed
+
+
+@pytest.mark.parametrize("move_diagonally", [False, True])
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_start_on_the_end(algorithm, move_diagonally):
+    board = load_maze_from_file("maze/3.txt")
+    result = ALGORITHMS[algorithm](
+        board, start=(2, 2), end=(2, 2), move_diagonally=move_diagonally
+    )
+
+    assert result.path == [(2, 2)]
+    assert result.cost == 0
+
+
+@pytest.mark.parametrize("move_diagonally", [False, True])
+def test_landmark_estimates(move_diagonally):
+    for seed in SEEDS:
+        board = random_board(seed)
+        expected = dijkstra_search(board, move_diagonally=move_diagonally)
+        estimates = build_landmarks(board, 4, move_diagonally).estimates(board)
+
+        result = ALGORITHMS["a_star_search"](
+            board, move_diagonally=move_diagonally, heuristic=estimates
+        )
+
+        assert result.found == expected.found, seed
+        if result.found:
+            assert math.isclose(result.cost, expected.cost), seed
+
+
+@pytest.mark.parametrize("move_diagonally", [False, True])
+def test_components_agree_with_dijkstra(move_diagonally):
+    for seed in SEEDS:
+        board = random_board(seed)
+        expected = dijkstra_search(board, move_diagonally=move_diagonally)
+
+        index = ComponentIndex(board, move_diagonally)
+        assert index.connected() == expected.found, seed
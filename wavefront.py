@@ -0,0 +1,108 @@
+import numpy as np
+
+from algorithms import SearchResult, no_path
+from grid import Grid
+
+
+def spread(grid, source, targets=(), labels=None):
+    # breadth first search one whole layer at a time: every layer is a couple of
+    # NumPy operations over the flat indices of the tiles in it. Stops once every
+    # target is reached, -1 stands for no target. The source can be many tiles,
+    # with labels a move between tiles with different labels is blocked
+    targets = np.asarray(targets, dtype=np.int64)
+    targets = targets[targets != -1]
+
+    distance = grid.full(-1, np.int32)
+    unseen = grid.full(False, np.bool_)
+    for chunk in grid.chunks():
+        unseen[chunk] = grid.walkable[chunk]
+        grid.tick(chunk.stop - chunk.start)
+    # scratch array used to drop tiles reached twice in the same layer
+    claim = grid.full(0, np.int32)
+    # the layers one after the other, which is the order they were expanded in
+    expanded = grid.full(0, np.int32)
+    count = 0
+
+    frontier = np.atleast_1d(np.asarray(source, dtype=np.int64))
+    distance[frontier] = 0
+    unseen[frontier] = False
+
+    step = 0
+
+    while len(frontier) > 0 and not (
+        len(targets) > 0 and (distance[targets] != -1).all()
+    ):
+        expanded[count : count + len(frontier)] = frontier
+        count += len(frontier)
+        step += 1
+
+        candidates = frontier[:, None] + grid.offsets
+        if labels is None:
+            candidates = candidates.reshape(-1)
+        else:
+            candidates = candidates[labels[candidates] == labels[frontier][:, None]]
+        candidates = candidates[unseen[candidates]]
+
+        order = np.arange(len(candidates), dtype=np.int32)
+        claim[candidates] = order
+        frontier = candidates[claim[candidates] == order]
+
+        distance[frontier] = step
+        unseen[frontier] = False
+
+        grid.tick(len(frontier))
+
+    return distance, expanded[:count]
+
+
+def distance_field(board, source=None, move_diagonally=False):
+    # steps from source (the start tile by default) to every tile, -1 where it
+    # can't be reached
+    grid = Grid(board, move_diagonally)
+    source = grid.start if source is None else grid.index(source)
+
+    if source == -1:
+        raise ValueError("The board has no START tile")
+
+    distance, _ = spread(grid, source)
+    return distance.reshape(grid.shape)
+
+
+def descend(grid, distance, end_index):
+    # walks from the end to the start, always onto a tile one step closer
+    path = [end_index]
+    index = end_index
+
+    while distance[index] > 0:
+        closer = distance[index] - 1
+        index = next(n for n in grid.neighbors(index) if distance[n] == closer)
+        path.append(index)
+
+    path.reverse()
+    return [grid.pos(index) for index in path]
+
+
+def wavefront_search(
+    board, on_expand=None, move_diagonally=False, stats=None, start=None, end=None
+):
+    grid = Grid(board, move_diagonally, start=start, end=end)
+    if not grid.placed:
+        return no_path(grid)
+
+    distance, expanded = spread(grid, grid.start, [grid.end])
+
+    # the layers are spread with NumPy, every expanded tile checks all its
+    # neighbors at once
+    if stats is not None:
+        stats.neighbor_checks += len(expanded) * len(grid.offsets)
+        on_expand = stats.watch_drawing(on_expand)
+
+    if on_expand is not None:
+        for index in expanded.tolist():
+            on_expand(grid.pos(index))
+
+    if distance[grid.end] == -1:
+        return SearchResult(grid.shape, [], expanded, float("inf"))
+
+    path = descend(grid, distance, grid.end)
+    return SearchResult(grid.shape, path, expanded, int(distance[grid.end]))